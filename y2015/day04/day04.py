@@ -1,15 +1,17 @@
-from hashlib import md5
+"""
+Run from the repository root:
+    python -m y2015.day04.day04
+
+The MD5 miner is shared with 2016 day 5 and kept with that year's tested
+package; see y2016/python/md5_miner.py.
+"""
+from y2016.python.md5_miner import find_first
+
+SECRET = b"iwrupvqb"
 
 
 def find_key(num_zeroes: int) -> int:
-    secret = "iwrupvqb"
-    digits = 0
-    while True:
-        hash_result = md5(f"{secret}{digits}".encode("utf8")).hexdigest()
-        if hash_result.startswith("0" * num_zeroes):
-            return digits
-        else:
-            digits += 1
+    return find_first(SECRET, num_zeroes)
 
 
 if __name__ == "__main__":
@@ -2,29 +2,41 @@ import re
 from sys import argv
 from typing import Dict, Tuple, Callable
 
+import numpy as np
 
-def solution(filename: str, part_num: int) -> int:
+GRID_SIZE = 1000
+
+
+def solution(filename: str, part_num: int, engine: str = "grid") -> int:
+    if engine == "grid":
+        return grid_solution(filename, part_num)
     grid = {}
     for row in open(filename, "r"):
         update_grid(grid, row.strip(), part_num)
     return sum(grid.values())
 
 
+def grid_solution(filename: str, part_num: int, grid_size: int = GRID_SIZE) -> int:
+    """Apply each instruction to a whole rectangle of a dense array at once"""
+    lights = np.zeros((grid_size, grid_size), dtype=np.int32)
+    for row in open(filename, "r"):
+        min_x, min_y, max_x, max_y, name = parse_instruction(row.strip())
+        GRID_UPDATES[(name, part_num)](lights[min_x:max_x + 1, min_y:max_y + 1])
+    return int(lights.sum())
+
+
 def update_grid(grid: Dict, instruction: str, part_num: int):
-    min_x, min_y, max_x, max_y, update_function = parse_instruction(
-        instruction, part_num
-    )
+    min_x, min_y, max_x, max_y, name = parse_instruction(instruction)
+    update_function = DICT_UPDATES[(name, part_num)]
     for x in range(min_x, max_x + 1):
         for y in range(min_y, max_y + 1):
             update_function(grid, (x, y))
 
 
-def parse_instruction(
-        instruction: str, part_num: int
-) -> Tuple[int, int, int, int, Callable]:
+def parse_instruction(instruction: str) -> Tuple[int, int, int, int, str]:
     """
-    Return coords and update function:
-      min-x, min-y, max-x, max-y, func
+    Return coords and update function name:
+      min-x, min-y, max-x, max-y, name
     """
     top_left, bottom_right = [
         [int(coord) for coord in pair.split(",")]
@@ -36,7 +48,7 @@ def parse_instruction(
         top_left[1],
         bottom_right[0],
         bottom_right[1],
-        globals()[f"{update_function_name}_{part_num}"],
+        update_function_name,
     )
 
 
@@ -76,6 +88,49 @@ def turn_on_2(grid: Dict, pos: Tuple[int, int]):
         grid[pos] = 1
 
 
+def toggle_grid_1(lights: np.ndarray):
+    lights ^= 1
+
+
+def turn_off_grid_1(lights: np.ndarray):
+    lights[...] = 0
+
+
+def turn_on_grid_1(lights: np.ndarray):
+    lights[...] = 1
+
+
+def toggle_grid_2(lights: np.ndarray):
+    lights += 2
+
+
+def turn_off_grid_2(lights: np.ndarray):
+    np.maximum(lights - 1, 0, out=lights)
+
+
+def turn_on_grid_2(lights: np.ndarray):
+    lights += 1
+
+
+DICT_UPDATES: Dict[Tuple[str, int], Callable] = {
+    ("toggle", 1): toggle_1,
+    ("turn_off", 1): turn_off_1,
+    ("turn_on", 1): turn_on_1,
+    ("toggle", 2): toggle_2,
+    ("turn_off", 2): turn_off_2,
+    ("turn_on", 2): turn_on_2,
+}
+
+GRID_UPDATES: Dict[Tuple[str, int], Callable] = {
+    ("toggle", 1): toggle_grid_1,
+    ("turn_off", 1): turn_off_grid_1,
+    ("turn_on", 1): turn_on_grid_1,
+    ("toggle", 2): toggle_grid_2,
+    ("turn_off", 2): turn_off_grid_2,
+    ("turn_on", 2): turn_on_grid_2,
+}
+
+
 if __name__ == "__main__":
     try:
         input_file = argv[1]
@@ -83,4 +138,3 @@ if __name__ == "__main__":
         print("PART 2", solution(input_file, 2))
     except IndexError:
         print("Enter path to data file!")
-
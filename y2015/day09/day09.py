@@ -1,6 +1,12 @@
+"""
+Run from the repository root:
+    python -m y2015.day09.day09 y2015/day09/data09.txt
+"""
 from sys import argv
 from typing import Dict, Tuple, Callable
 
+from y2015.route_solver import best_route, weight_matrix
+
 TravelMap = Dict[str, Dict[str, int]]
 
 
@@ -29,33 +35,11 @@ def add_locs(travel_map: TravelMap, loc1: str, loc2: str, dist: int):
 
 
 def navigate(locations: TravelMap, comp_func: Callable) -> Tuple[int, Dict[str, int]]:
-    """Return the distance traveled and best path
-    given each possible starting location."""
-    best_dist = comp_func(float("inf"), float("-inf")) * -1
-    best_path = {}
-    for loc in locations:
-        new_dist, new_path = nav_helper(locations, loc, comp_func)
-        if new_dist == comp_func(new_dist, best_dist):
-            best_dist = new_dist
-            best_path = new_path
-    return best_dist, best_path
-
-
-def nav_helper(
-        locations: TravelMap, start_loc: str, comp_func: Callable
-) -> Tuple[int, Dict[str, int]]:
-    """Return the distance traveled and best path for the given start_loc"""
-    cur_loc = start_loc
-    path = {cur_loc: 0}  # location: visit order
-    dist = 0
-    while len(path) < len(locations):
-        destinations = locations[cur_loc]
-        available_dest_names = set(destinations.keys()) - set(path.keys())
-        next_loc = comp_func(available_dest_names, key=lambda dest: destinations[dest])
-        dist += destinations[next_loc]
-        path[next_loc] = path[cur_loc] + 1
-        cur_loc = next_loc
-    return dist, path
+    """Return the exact min or max distance traveled and its path,
+    as chosen by comp_func."""
+    names, distances = weight_matrix(locations)
+    best_dist, order = best_route(distances, maximize=comp_func is max)
+    return best_dist, {names[loc]: visit for visit, loc in enumerate(order)}
 
 
 def print_path(path: Dict[str, int]):
@@ -1,5 +1,11 @@
 import re
+from collections import Counter
+from itertools import groupby
 from sys import argv
+from typing import Dict, List, Set
+
+# Length of the sequence prefix tracked when predicting first digits
+PREFIX_WIDTH = 16
 
 
 def look_and_say(start_seq: str, iterations: int) -> str:
@@ -41,10 +47,82 @@ def convert_fast(seq: str) -> str:
     return next_seq
 
 
+def evolve(seq: str) -> str:
+    return "".join(f"{len(list(run))}{digit}" for digit, run in groupby(seq))
+
+
+def first_digits(seq: str) -> Set[str]:
+    """
+    Return every digit that ever starts seq or one of its descendants.
+
+    Only an exact prefix of each generation is evolved: the final pair of
+    each evolved prefix is dropped, since its run may continue past the
+    prefix. The prefixes cycle eventually, which ends the search.
+    """
+    digits = set()
+    whole = len(seq) <= PREFIX_WIDTH
+    prefix = seq[:PREFIX_WIDTH]
+    seen = set()
+    while (prefix, whole) not in seen:
+        if not prefix:
+            raise ValueError(f"Cannot follow the start of {seq}")
+        seen.add((prefix, whole))
+        digits.add(prefix[0])
+        next_prefix = evolve(prefix)
+        if not whole:
+            next_prefix = next_prefix[:-2]
+        whole = whole and len(next_prefix) <= PREFIX_WIDTH
+        prefix = next_prefix[:PREFIX_WIDTH]
+    return digits
+
+
+def decompose(seq: str) -> List[str]:
+    """
+    Split seq into Conway's elements: pieces that evolve independently forever.
+
+    A piece ending in digit d and the rest R stay apart for good when d
+    never starts R or any of its descendants, since every descendant of the
+    piece still ends in d.
+    """
+    cuts = [0]
+    for i in range(1, len(seq)):
+        if seq[i - 1] != seq[i] and seq[i - 1] not in first_digits(seq[i:]):
+            cuts.append(i)
+    cuts.append(len(seq))
+    return [seq[start:end] for start, end in zip(cuts, cuts[1:])]
+
+
+def sequence_length(start_seq: str, iterations: int) -> int:
+    """Return the sequence length after iterations by evolving element
+    counts, without building the sequence"""
+    try:
+        elements = Counter(decompose(start_seq))
+    except ValueError:
+        return len(look_and_say_bytes(start_seq, iterations))
+
+    decays = {}  # type: Dict[str, Counter]
+    for _ in range(iterations):
+        next_elements = Counter()
+        for element, count in elements.items():
+            if element not in decays:
+                decays[element] = Counter(decompose(evolve(element)))
+            for product, num_products in decays[element].items():
+                next_elements[product] += count * num_products
+        elements = next_elements
+    return sum(len(element) * count for element, count in elements.items())
+
+
+def look_and_say_bytes(start_seq: str, iterations: int) -> bytes:
+    cur_seq = start_seq.encode()
+    for _ in range(iterations):
+        cur_seq = re.sub(rb"(.)\1*", lambda run: b"%d%c" % (len(run.group()), run.group()[0]), cur_seq)
+    return cur_seq
+
+
 if __name__ == "__main__":
     try:
         num_iterations = int(argv[1])
-        new_val = len(look_and_say("3113322113", num_iterations))
+        new_val = sequence_length("3113322113", num_iterations)
         print("SEQUENCE LENGTH:", new_val)
     except IndexError:
         print("Enter number of iterations!")
@@ -1,6 +1,12 @@
+"""
+Run from the repository root:
+    python -m y2015.day13.day13 y2015/day13/data13.txt
+"""
 import re
 from sys import argv
-from typing import List, Dict, Tuple
+from typing import Dict, Tuple
+
+from y2015.route_solver import best_route, weight_matrix
 
 
 def parse_input(filename: str) -> Dict[str, Dict[str, int]]:
@@ -30,30 +36,11 @@ def add_self(all_preferences: Dict[str, Dict[str, int]]):
     all_preferences["Host"] = {attendee: 0 for attendee in attendees}
 
 
-def score_arrangements(
-        preferences: Dict[str, Dict[str, int]],
-        cur_arrangement: List[str],
-        results: Dict[int, List[str]]
-) -> Dict[int, List[str]]:
-    if len(cur_arrangement) == len(preferences):
-        results[calc_happiness(preferences, cur_arrangement)] = [name for name in cur_arrangement]
-    else:
-        remaining = list(set(preferences.keys()) - set(cur_arrangement))
-        for name in remaining:
-            score_arrangements(preferences, cur_arrangement + [name], results)
-    return results
-
-
-def calc_happiness(preferences: Dict[str, Dict[str, int]], seating: List[str]) -> int:
-    total_happiness = 0
-    for pos, name in enumerate(seating):
-        num_people = len(seating)
-        # Add prior person
-        prior_name = seating[pos - 1]
-        total_happiness += preferences[name][prior_name]
-        # Add next person
-        next_name = seating[(pos + 1) % num_people]
-        total_happiness += preferences[name][next_name]
+def best_happiness(preferences: Dict[str, Dict[str, int]]) -> int:
+    """Return the happiness of the best seating around the table"""
+    _, happiness = weight_matrix(preferences)
+    # Both neighbours' happiness counts for each adjacent pair
+    total_happiness, _ = best_route(happiness + happiness.T, maximize=True, cycle=True)
     return total_happiness
 
 
@@ -67,8 +54,8 @@ if __name__ == "__main__":
     try:
         input_file = argv[1]
         seating_preferences = parse_input(input_file)
-        print("PART 1", max(score_arrangements(seating_preferences, [], {}).keys()))
+        print("PART 1", best_happiness(seating_preferences))
         add_self(seating_preferences)
-        print("PART 2", max(score_arrangements(seating_preferences, [], {}).keys()))
+        print("PART 2", best_happiness(seating_preferences))
     except IndexError:
         print("Enter path to data file!")
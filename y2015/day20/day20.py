@@ -1,7 +1,70 @@
 from sys import argv
 from typing import Set
 
-FACTOR_TABLE = {}
+import numpy as np
+
+PRESENTS_PER_ELF = {1: 10, 2: 11}
+HOUSE_LIMITS = {1: -1, 2: 50}
+# Most houses held in memory at once by the sieve
+CHUNK_SIZE = 1 << 16
+
+
+def lowest_house(goal: int, part_num: int, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Return the lowest house number to get at least goal presents.
+
+    Elves' deliveries are summed into a numpy array one chunk of houses at a
+    time, in order, so the first house in a chunk to reach the goal is the
+    answer. The bound on house numbers doubles until it is found. Every
+    array the sieve allocates is at most chunk_size long.
+    """
+    per_elf = PRESENTS_PER_ELF[part_num]
+    limit = HOUSE_LIMITS[part_num]
+    low = 1
+    bound = 2
+    while True:
+        while low < bound:
+            high = min(bound, low + chunk_size)
+            presents = sieve_chunk(low, high, limit) * per_elf
+            reached = np.flatnonzero(presents >= goal)
+            if len(reached):
+                return low + int(reached[0])
+            low = high
+        bound *= 2
+
+
+def sieve_chunk(low: int, high: int, limit: int = -1) -> np.ndarray:
+    """
+    Return the sum of the elf numbers delivering to each house in
+    range(low, high). With a limit, elf e stops after house e * limit.
+    """
+    houses = np.zeros(high - low, dtype=np.int64)
+
+    # Elves that visit the chunk more than once, one slice per elf
+    many_visits = min(high - low, high)
+    for elf in range(1, many_visits):
+        first = -(-low // elf) * elf
+        last = high if limit == -1 else min(high, elf * limit + 1)
+        if first < last:
+            houses[first - low:last - low:elf] += elf
+
+    # Elves that visit at most once: find the first visits of a block of as
+    # many elves as there are houses at a time, keeping memory to the chunk
+    first_elf = max(many_visits, 1)
+    if limit != -1:
+        # Elves that stopped delivering before the chunk
+        first_elf = max(first_elf, -(-low // limit))
+    for block_start in range(first_elf, high, high - low):
+        elves = np.arange(block_start, min(high, block_start + high - low),
+                          dtype=np.int64)
+        visits = -(-low // elves) * elves
+        visiting = visits < high
+        if limit != -1:
+            visiting &= visits <= elves * limit
+        houses += np.bincount(visits[visiting] - low,
+                              weights=elves[visiting],
+                              minlength=high - low).astype(np.int64)
+    return houses
 
 
 def math_stuff(goal: int, part_num: int) -> int:
@@ -9,7 +72,7 @@ def math_stuff(goal: int, part_num: int) -> int:
         goal /= 10
     else:
         goal /= 11
-    house_num = int(goal // 10)
+    house_num = max(int(goal // 10), 1)
     p_at_h = presents_at_house(house_num, part_num)
     while p_at_h < goal:
         house_num += 1
@@ -19,32 +82,28 @@ def math_stuff(goal: int, part_num: int) -> int:
 
 
 def presents_at_house(house_num: int, part_num: int) -> int:
-    limit = -1 if part_num == 1 else 50
+    limit = HOUSE_LIMITS[part_num]
     fact_sum = sum(factors(house_num, limit))
     return fact_sum
 
 
 def factors(num: int, limit: int) -> Set[int]:
-    global FACTOR_TABLE
     facts = {num}
     test_factor = num >> 1
-    stop = 1 if limit == -1 else num // limit
+    # Lowest elf to still deliver here, with a limit on houses per elf
+    stop = 1 if limit == -1 else -(-num // limit)
 
     while test_factor >= stop:
         if test_factor not in facts:
             div, mod = divmod(num, test_factor)
             if not mod:
-                # try:
-                #     facts |= FACTOR_TABLE[test_factor]
-                # except KeyError:
                 facts.add(test_factor)
         test_factor -= 1
 
-    FACTOR_TABLE[num] = facts
     return facts
 
 
 if __name__ == "__main__":
     presents_goal = int(argv[1])
-    # print("PART 1:", math_stuff(presents_goal, 1))
-    print("PART 2:", math_stuff(presents_goal, 2))
+    print("PART 1:", lowest_house(presents_goal, 1))
+    print("PART 2:", lowest_house(presents_goal, 2))
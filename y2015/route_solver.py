@@ -0,0 +1,69 @@
+"""
+Exact best routes through every location with Held-Karp dynamic programming.
+
+best[mask, j] holds the cheapest way to visit the locations in bitmask mask
+ending at j. Masks are filled in order of size, one numpy operation per
+(size, next location) pair, so n locations take O(n^2 2^n) work instead of
+O(n!) permutations.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+Graph = Dict[str, Dict[str, int]]
+
+
+def weight_matrix(graph: Graph) -> Tuple[List[str], np.ndarray]:
+    """Return the graph's locations and a matrix of weights between them,
+    with inf where there is no edge"""
+    names = sorted(set(graph) | {name for edges in graph.values() for name in edges})
+    index = {name: i for i, name in enumerate(names)}
+    weights = np.full((len(names), len(names)), np.inf)
+    for name, edges in graph.items():
+        for other, weight in edges.items():
+            weights[index[name], index[other]] = weight
+    return names, weights
+
+
+def best_route(weights: np.ndarray, maximize: bool = False, cycle: bool = False) -> Tuple[int, List[int]]:
+    """
+    Return the total weight and order of the best route visiting every
+    location once, as an open path or, with cycle, returning to the start.
+    """
+    num_locs = len(weights)
+    if maximize:
+        # Maximize by minimizing the negated weights, keeping missing edges impossible
+        weights = np.where(np.isinf(weights), np.inf, -weights)
+    full = (1 << num_locs) - 1
+
+    best = np.full((1 << num_locs, num_locs), np.inf)
+    previous = np.zeros((1 << num_locs, num_locs), dtype=np.int8)
+    starts = [0] if cycle else range(num_locs)
+    for start in starts:
+        best[1 << start, start] = 0
+
+    masks = np.arange(1 << num_locs)
+    sizes = np.array([bin(mask).count("1") for mask in range(1 << num_locs)])
+    for size in range(1, num_locs):
+        layer = masks[sizes == size]
+        for loc in range(num_locs):
+            sources = layer[(layer >> loc) & 1 == 0]
+            options = best[sources] + weights[:, loc]
+            best[sources | (1 << loc), loc] = options.min(axis=1)
+            previous[sources | (1 << loc), loc] = options.argmin(axis=1)
+
+    finish = best[full] + (weights[:, 0] if cycle else 0)
+    last = int(finish.argmin())
+    if np.isinf(finish[last]):
+        raise ValueError("No route visits every location")
+
+    order = [last]
+    mask = full
+    while len(order) < num_locs:
+        loc = order[-1]
+        order.append(int(previous[mask, loc]))
+        mask ^= 1 << loc
+    order.reverse()
+
+    total = int(finish[last])
+    return (-total if maximize else total), order
@@ -0,0 +1,81 @@
+"""
+Search for integers whose MD5 hash, appended to a secret, starts with zeroes.
+
+The secret is hashed once and the hash state copied for every candidate, and
+digests are compared as raw bytes. The search space is split into chunks that
+a process pool works through in order, so hits are always yielded in
+increasing order and the first hit is the minimum.
+
+2015 day 4 mines the same way. The miner lives here rather than in a
+shared top-level module because y2016/python is the only importable
+package in the repo with its own tests. Callers from other years run
+from the repository root with python -m.
+"""
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from hashlib import md5
+
+CHUNK_SIZE = 50_000
+
+
+def zero_prefix_bound(num_zeroes: int) -> bytes:
+    """
+    Return the bound below which a digest's first (num_zeroes + 1) // 2 bytes
+    start with num_zeroes zero nibbles.
+    """
+    num_bytes = (num_zeroes + 1) // 2
+    if not num_bytes:
+        return b"\x01"
+    last_byte = b"\x10" if num_zeroes % 2 else b"\x01"
+    return bytes(num_bytes - 1) + last_byte
+
+
+def mine_chunk(secret: bytes, num_zeroes: int, start: int, stop: int) -> list[tuple[int, bytes]]:
+    """Return (number, digest) for every hit in range(start, stop)."""
+    secret_hash = md5(secret)
+    bound = zero_prefix_bound(num_zeroes)
+    num_bytes = (num_zeroes + 1) // 2
+    hits = []
+    for number in range(start, stop):
+        candidate = secret_hash.copy()
+        candidate.update(b"%d" % number)
+        digest = candidate.digest()
+        if digest[:num_bytes] < bound:
+            hits.append((number, digest))
+    return hits
+
+
+def mine(
+        secret: bytes,
+        num_zeroes: int,
+        start: int = 0,
+        max_workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[int, bytes]]:
+    """Yield (number, digest) for every hit from start upwards, in order."""
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        while True:
+            yield from mine_chunk(secret, num_zeroes, start, start + chunk_size)
+            start += chunk_size
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future] = deque()
+        try:
+            while True:
+                # Keep every worker busy while waiting on the oldest chunk
+                while len(pending) < 2 * max_workers:
+                    pending.append(executor.submit(mine_chunk, secret, num_zeroes, start, start + chunk_size))
+                    start += chunk_size
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def find_first(secret: bytes, num_zeroes: int, max_workers: int | None = None) -> int:
+    """Return the lowest number whose hash has num_zeroes leading zeroes."""
+    number, _ = next(mine(secret, num_zeroes, max_workers=max_workers))
+    return number
@@ -0,0 +1,42 @@
+from hashlib import md5
+from itertools import islice
+
+import pytest
+
+from y2016.python.md5_miner import find_first, mine, zero_prefix_bound
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("num_zeroes", [1, 2, 3])
+def test_mine_matches_hexdigest_search(num_zeroes: int, max_workers: int):
+    # GIVEN
+    secret = b"abcdef"
+    expected = [
+        number for number in range(20_000)
+        if md5(secret + str(number).encode()).hexdigest().startswith("0" * num_zeroes)
+    ]
+
+    # WHEN
+    hits = mine(secret, num_zeroes, max_workers=max_workers, chunk_size=1_000)
+    found = [number for number, _ in islice(hits, len(expected))]
+    hits.close()
+
+    # THEN
+    assert found == expected
+
+
+@pytest.mark.parametrize(
+    "num_zeroes, expected",
+    [
+        (0, b"\x01"),
+        (1, b"\x10"),
+        (4, b"\x00\x01"),
+        (5, b"\x00\x00\x10"),
+    ]
+)
+def test_zero_prefix_bound(num_zeroes: int, expected: bytes):
+    assert zero_prefix_bound(num_zeroes) == expected
+
+
+def test_find_first():
+    assert find_first(b"abcdef", 5, max_workers=2) == 609043
@@ -0,0 +1,50 @@
+import heapq
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, TypeVar
+
+Step = TypeVar('Step', bound=Hashable)
+
+
+def schedule(dependencies: Iterable[Tuple[Step, Step]], num_workers: int = 1,
+             duration: Callable[[Step], int] = lambda step: 0,
+             steps: Iterable[Step] = ()) -> Tuple[List[Step], int]:
+    """
+    Run a dependency graph on num_workers workers.
+
+    dependencies holds (required, dependent) pairs and steps any extra steps
+    without dependencies. A free worker always takes the smallest ready
+    step. Return the steps in order of completion and the total time.
+    Runs in O((steps + dependencies) log steps).
+    """
+    permits = defaultdict(list)     # type: Dict[Step, List[Step]]
+    in_degree = {step: 0 for step in steps}
+    for required, dependent in dependencies:
+        permits[required].append(dependent)
+        in_degree.setdefault(required, 0)
+        in_degree[dependent] = in_degree.get(dependent, 0) + 1
+
+    ready = [step for step, count in in_degree.items() if not count]
+    heapq.heapify(ready)
+    # (finish time, step) for each busy worker
+    in_progress = []    # type: List[Tuple[int, Step]]
+    finished = []       # type: List[Step]
+    now = 0
+
+    while ready or in_progress:
+        while ready and len(in_progress) < num_workers:
+            step = heapq.heappop(ready)
+            heapq.heappush(in_progress, (now + duration(step), step))
+
+        # Finish everything due at the next completion time before assigning
+        now = in_progress[0][0]
+        while in_progress and in_progress[0][0] == now:
+            _, step = heapq.heappop(in_progress)
+            finished.append(step)
+            for dependent in permits[step]:
+                in_degree[dependent] -= 1
+                if not in_degree[dependent]:
+                    heapq.heappush(ready, dependent)
+
+    if len(finished) < len(in_degree):
+        raise ValueError("Dependencies contain a cycle")
+    return finished, now
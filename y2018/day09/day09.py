@@ -1,4 +1,6 @@
 import re
+import tracemalloc
+from array import array
 from sys import argv
 from typing import List
 
@@ -82,7 +84,8 @@ class LinkedList:
         return self._num_nodes
 
 
-def play_marbles(data: List[int], part_num: int):
+def play_marbles(data: List[int], part_num: int,
+                 engine: str = 'array', trace_memory: bool = False) -> int:
     num_players, *rest = data
     try:
         num_marbles, max_score = rest
@@ -91,6 +94,25 @@ def play_marbles(data: List[int], part_num: int):
     if part_num == 2:
         num_marbles *= 100
 
+    if not trace_memory:
+        score = ENGINES[engine](num_players, num_marbles)
+        print("MAX SCORE:", score)
+        return score
+
+    # Only this game's allocations count towards its peak. Tracing slows
+    # every allocation, so it is only done when asked for.
+    tracemalloc.start()
+    try:
+        score = ENGINES[engine](num_players, num_marbles)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    print("MAX SCORE:", score, "PEAK KB:", peak // 1024)
+    return score
+
+
+def linked_list_score(num_players: int, num_marbles: int) -> int:
     players = [0 for _ in range(num_players)]
 
     player_num = 0
@@ -101,7 +123,42 @@ def play_marbles(data: List[int], part_num: int):
         player_num = (player_num + 1) % num_players
         players[player_num] += points
 
-    print("MAX SCORE:", max(players))
+    return max(players)
+
+
+def array_score(num_players: int, num_marbles: int) -> int:
+    """
+    Play the game on a circle kept as next/prev marble indexes in two
+    preallocated arrays, so no object is created per marble.
+    """
+    next_marble = array('I', [0]) * (num_marbles + 1)
+    prev_marble = array('I', [0]) * (num_marbles + 1)
+    players = [0] * num_players
+
+    current = 0
+    for marble_num in range(1, num_marbles + 1):
+        if marble_num % KEEPER:
+            left = next_marble[current]
+            right = next_marble[left]
+            next_marble[left] = marble_num
+            prev_marble[marble_num] = left
+            next_marble[marble_num] = right
+            prev_marble[right] = marble_num
+            current = marble_num
+        else:
+            removed = current
+            for _ in range(BACKUP):
+                removed = prev_marble[removed]
+            left = prev_marble[removed]
+            current = next_marble[removed]
+            next_marble[left] = current
+            prev_marble[current] = left
+            players[marble_num % num_players] += marble_num + removed
+
+    return max(players)
+
+
+ENGINES = {'array': array_score, 'linked': linked_list_score}
 
 
 def _inset_marble(new_marble: Node, circle: LinkedList) -> int:
@@ -131,5 +188,9 @@ if __name__ == '__main__':
                       re.findall(r'\d+', line.strip())]
         part = int(argv[2])
         kwargs = {'data': input_nums, 'part_num': part}
+        if len(argv) > 3:
+            kwargs['engine'] = argv[3]
+        if len(argv) > 4:
+            kwargs['trace_memory'] = argv[4] == 'trace'
 
         play_marbles(**kwargs)
@@ -1,5 +1,7 @@
 from sys import argv
-from typing import Tuple, List, Dict
+from typing import Iterable, Optional, Tuple, List, Dict
+
+import numpy as np
 
 SERIAL_NUMBER = 3628
 RACK_ID_INCREMENT = 10
@@ -58,24 +60,53 @@ def _power_level(coord: Tuple[int, int]) -> int:
     return p - 5
 
 
+def power_grid(serial_number: int = SERIAL_NUMBER,
+               grid_size: int = GRID_SIZE) -> np.ndarray:
+    """Return every cell's power level, indexed [y, x] from 0"""
+    x = np.arange(1, grid_size + 1, dtype=np.int64)
+    y = x[:, np.newaxis]
+    rack_id = x + RACK_ID_INCREMENT
+    # Hundreds digit, so 0 when the product is under 100
+    return (y * rack_id + serial_number) * rack_id // 100 % 10 - 5
+
+
+def summed_area_table(grid: np.ndarray) -> np.ndarray:
+    """Return table where table[y, x] is the sum of grid[:y, :x]"""
+    table = np.zeros((grid.shape[0] + 1, grid.shape[1] + 1), dtype=np.int64)
+    table[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+    return table
+
+
+def find_best_square(serial_number: int = SERIAL_NUMBER,
+                     grid_size: int = GRID_SIZE,
+                     square_sizes: Optional[Iterable[int]] = None) -> \
+        Tuple[Tuple[int, int], int, int]:
+    """Return the 1-indexed top left coord, size and power of the square with
+    the most power, checking every size in square_sizes (default all)"""
+    table = summed_area_table(power_grid(serial_number, grid_size))
+    if square_sizes is None:
+        square_sizes = range(1, grid_size + 1)
+
+    best_coord = (0, 0)
+    best_size = 0
+    best_power = None
+    for size in square_sizes:
+        # Sum of every size x size square, indexed by its top left corner
+        powers = (table[size:, size:] - table[:-size, size:] -
+                  table[size:, :-size] + table[:-size, :-size])
+        y, x = np.unravel_index(np.argmax(powers), powers.shape)
+        if best_power is None or powers[y, x] > best_power:
+            best_coord = (int(x) + 1, int(y) + 1)
+            best_size = size
+            best_power = int(powers[y, x])
+    return best_coord, best_size, best_power
+
+
 if __name__ == '__main__':
     size = int(argv[1])
-    if size:
-        best_coord, best_power = find_best_power_coord(size)
-        best_size = size
-    else:
-        best_coord = (0, 0)
-        best_size = 0
-        best_power = 0
-        for s in range(1, GRID_SIZE + 1):
-            new_coord, new_power = find_best_power_coord(s)
-            if new_power > best_power:
-                best_coord = new_coord
-                best_power = new_power
-                best_size = s
-            elif new_power < best_size:
-                break
-
-            print("BEST COORD: {} HAS POWER: {} AT SIZE: {}".format(best_coord,
-                                                                    best_power,
-                                                                    best_size))
+    serial = int(argv[2]) if len(argv) > 2 else SERIAL_NUMBER
+    best_coord, best_size, best_power = find_best_square(
+        serial, square_sizes=[size] if size else None)
+    print("BEST COORD: {} HAS POWER: {} AT SIZE: {}".format(best_coord,
+                                                            best_power,
+                                                            best_size))
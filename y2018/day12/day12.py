@@ -1,55 +1,109 @@
 from sys import argv
-from typing import Set, List
+from typing import List, Set, Tuple
 
-
-ADJUST_SIZE = 300
+PART_2_GENERATIONS = 50000000000
 
 
 def get_positive_conditions(data: List[str]) -> Set[str]:
     return {c[:5] for c in data if c.endswith('#')}
 
 
-def apply_conditions(plants_row: str, positive_conditions: Set[str]) -> str:
-    new_row = ['.', '.']
-    for i in range(2, len(plants_row) - 2):
-        section = plants_row[i - 2:i + 3]
-        if section in positive_conditions:
-            new_row.append('#')
-        else:
-            new_row.append('.')
+def build_rule_table(positive_conditions: Set[str]) -> List[bool]:
+    """
+    Return the next state of a pot for each of the 32 possible windows.
+
+    A window is indexed with its leftmost pot as bit 0 and its rightmost
+    pot as bit 4.
+    """
+    table = [False] * 32
+    for condition in positive_conditions:
+        window = sum(1 << i for i, pot in enumerate(condition) if pot == '#')
+        table[window] = True
+    if table[0]:
+        raise ValueError("Empty pots must stay empty")
+    return table
+
+
+def parse_row(plants_row: str) -> Tuple[int, int]:
+    """Return (plants, offset): bit k of plants is set if pot offset + k has a plant."""
+    plants = int(plants_row[::-1].replace('#', '1').replace('.', '0'), 2)
+    return trim_row(plants, 0)
+
+
+def trim_row(plants: int, offset: int) -> Tuple[int, int]:
+    """Drop empty pots below the first plant, moving offset to match."""
+    if not plants:
+        return 0, 0
+    empty = (plants & -plants).bit_length() - 1
+    return plants >> empty, offset + empty
+
+
+def apply_conditions(plants: int, offset: int,
+                     rule_table: List[bool]) -> Tuple[int, int]:
+    """
+    Advance the row one generation; it grows only next to existing plants.
+
+    The new row starts two pots left of the old one. Shifting the old row
+    left by 4 - i lines pot i of each new pot's window up with that pot, so
+    every live window is matched across the whole row at once by ANDing
+    the shifted rows or their complements.
+    """
+    mask = (1 << (plants.bit_length() + 4)) - 1
+    shifted = [plants << (4 - i) for i in range(5)]
+    empty = [~row & mask for row in shifted]
+    new_plants = 0
+    for window, alive in enumerate(rule_table):
+        if alive:
+            matches = mask
+            for i in range(5):
+                matches &= shifted[i] if window >> i & 1 else empty[i]
+            new_plants |= matches
+    return trim_row(new_plants, offset - 2)
+
+
+def count_plants(plants: int, offset: int) -> int:
+    """Return the sum of the numbers of pots with plants."""
+    total = offset * plants.bit_count()
+    while plants:
+        lowest = plants & -plants
+        total += lowest.bit_length() - 1
+        plants ^= lowest
+    return total
 
-    return ''.join(new_row + ['.', '.'])
 
+def sum_after(plants: int, offset: int, rule_table: List[bool],
+              generations: int) -> int:
+    """
+    Return the pot number sum after generations.
 
-def count_plants(plants_row: str, start_idx: int) -> int:
-    total = 0
-    for idx, plant in enumerate(plants_row):
-        if plant == '#':
-            total += idx + start_idx
-    return total
+    Once a generation leaves the pattern unchanged and only shifts it, every
+    later generation shifts it the same way, so the rest is extrapolated.
+    """
+    for generation in range(generations):
+        new_plants, new_offset = apply_conditions(plants, offset, rule_table)
+        if new_plants == plants:
+            shift = new_offset - offset
+            remaining = generations - generation
+            return (count_plants(plants, offset) +
+                    remaining * shift * plants.bit_count())
+        plants, offset = new_plants, new_offset
+    return count_plants(plants, offset)
 
 
 if __name__ == '__main__':
     data_file = argv[1]
-    iterations = int(argv[2])
+    iterations = int(argv[2]) if len(argv) > 2 else 20
 
     with open(data_file, 'r') as f_in:
-        plants = (('.' * ADJUST_SIZE) +
-                  f_in.readline().strip().split()[-1] +
-                  ('.' * ADJUST_SIZE))
+        initial_row = f_in.readline().strip().split()[-1]
         next(f_in)
         raw_conditions = [c.strip() for c in f_in.readlines()]
 
-        conditions = get_positive_conditions(raw_conditions)
-
-    last_count = count_plants(plants, -1 * ADJUST_SIZE)
-    print("PLANT COUNT:", last_count)
-
-    for i in range(iterations):
-        plants = apply_conditions(plants, conditions)
-        plant_count = count_plants(plants, -1 * ADJUST_SIZE)
-        print("PLANT COUNT DIFF {} AT {}".format(plant_count - last_count, i))
-        last_count = plant_count
+    conditions = build_rule_table(get_positive_conditions(raw_conditions))
+    start_plants, start_offset = parse_row(initial_row)
 
-    # plant_count = count_plants(plants, -1 * ADJUST_SIZE)
-    # print("PLANT COUNT:", plant_count)
+    print("PLANT COUNT:", sum_after(start_plants, start_offset, conditions,
+                                    iterations))
+    print("PLANT COUNT AFTER {}:".format(PART_2_GENERATIONS),
+          sum_after(start_plants, start_offset, conditions,
+                    PART_2_GENERATIONS))
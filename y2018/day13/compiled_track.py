@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class CompiledTrack:
+    """
+    A TrackMap compiled to integer cell codes in a flat bytearray.
+
+    Directions are 0 (up), 1 (right), 2 (down) and 3 (left), so turning left
+    or right is a step around that cycle and both corner symbols reduce to
+    arithmetic on the direction.
+    """
+    EMPTY, STRAIGHT, SLASH, BACKSLASH, JUNCTION = range(5)
+    CELL_CODES = {'-': STRAIGHT, '|': STRAIGHT, '/': SLASH,
+                  '\\': BACKSLASH, '+': JUNCTION}
+    CART_DIRECTIONS = {'^': 0, '>': 1, 'v': 2, '<': 3}
+
+    def __init__(self, rows: List[str]):
+        rows = [row.rstrip('\n') for row in rows]
+        self.width = max(len(row) for row in rows)
+        self.cells = bytearray()
+        # (cell, direction) for each cart, in reading order
+        self.carts = []     # type: List[Tuple[int, int]]
+        for row in rows:
+            for symbol in row.ljust(self.width):
+                if symbol in self.CART_DIRECTIONS:
+                    # Carts always start on a straight piece of track
+                    self.carts.append((len(self.cells),
+                                       self.CART_DIRECTIONS[symbol]))
+                    self.cells.append(self.STRAIGHT)
+                else:
+                    self.cells.append(self.CELL_CODES.get(symbol, self.EMPTY))
+        self.steps = (-self.width, 1, self.width, -1)
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        y, x = divmod(cell, self.width)
+        return x, y
+
+
+class CartSimulation:
+    """
+    Ticks every cart over a CompiledTrack.
+
+    Carts live in parallel lists indexed by cart number and an occupancy
+    dict maps each occupied cell to its cart, so a move is a table lookup
+    and a collision check is one dict lookup: a tick costs O(carts log carts)
+    whatever the size of the map.
+    """
+    # Junction turns cycle left, straight, right
+    TURNS = (-1, 0, 1)
+
+    def __init__(self, track: CompiledTrack):
+        self._track = track
+        self._cells = [cell for cell, _ in track.carts]
+        self._directions = [direction for _, direction in track.carts]
+        self._turns = [0] * len(track.carts)
+        self._occupied = {cell: cart for cart, cell in
+                          enumerate(self._cells)}   # type: Dict[int, int]
+        self.ticks = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self._occupied)
+
+    def tick(self) -> List[Tuple[int, int]]:
+        """Move every cart once in reading order and return crash coords."""
+        crashes = []
+        for cart in sorted(self._occupied.values(),
+                           key=self._cells.__getitem__):
+            cell = self._cells[cart]
+            if self._occupied.get(cell) != cart:
+                # Destroyed earlier in this tick
+                continue
+            del self._occupied[cell]
+            cell = self._move(cart, cell)
+            other = self._occupied.pop(cell, None)
+            if other is None:
+                self._occupied[cell] = cart
+            else:
+                crashes.append(self._track.coords(cell))
+        self.ticks += 1
+        return crashes
+
+    def _move(self, cart: int, cell: int) -> int:
+        direction = self._directions[cart]
+        cell += self._track.steps[direction]
+        code = self._track.cells[cell]
+        if code == CompiledTrack.SLASH:
+            direction ^= 1
+        elif code == CompiledTrack.BACKSLASH:
+            direction = 3 - direction
+        elif code == CompiledTrack.JUNCTION:
+            turn = self._turns[cart]
+            direction = (direction + self.TURNS[turn]) % 4
+            self._turns[cart] = (turn + 1) % 3
+        self._cells[cart] = cell
+        self._directions[cart] = direction
+        return cell
+
+    def first_crash(self) -> Tuple[int, int]:
+        while True:
+            crashes = self.tick()
+            if crashes:
+                return crashes[0]
+
+    def last_cart(self) -> Optional[Tuple[int, int]]:
+        """Return the last cart's coords at the end of the tick that leaves it alone."""
+        while self.remaining > 1:
+            self.tick()
+        if not self._occupied:
+            return None
+        return self._track.coords(next(iter(self._occupied)))
@@ -1,6 +1,8 @@
 from sys import argv
 from typing import List, Dict, Tuple, Set
 
+from compiled_track import CartSimulation, CompiledTrack
+
 
 class TrackMap:
     """A class for representing a cart map."""
@@ -189,11 +191,21 @@ class Simulation:
 if __name__ == '__main__':
     filename = argv[1]
     part = int(argv[2])
+    engine = argv[3] if len(argv) > 3 else 'compiled'
 
-    tm = TrackMap(filename)
-    tm.load_map()
-
-    sim = Simulation(tm)
-    sim.run(part)
-    print(sim)
+    if engine == 'compiled':
+        with open(filename, 'r') as f_in:
+            cart_sim = CartSimulation(CompiledTrack(f_in.readlines()))
+        if part == 1:
+            print("FIRST CRASH:", cart_sim.first_crash())
+        else:
+            print("LAST CART:", cart_sim.last_cart())
+        print("Cycles:", cart_sim.ticks)
+    else:
+        tm = TrackMap(filename)
+        tm.load_map()
+
+        sim = Simulation(tm)
+        sim.run(part)
+        print(sim)
 
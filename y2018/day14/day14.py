@@ -57,18 +57,91 @@
 #             RECIPES += to_append
 #         print("RECIPES:", len(RECIPES))
 
-# Copied from shared solution on Reddit:
-# https://www.reddit.com/r/adventofcode/comments/a61ojp/2018_day_14_solutions/
+from sys import argv
+from typing import List
 
-recipes = '793061'
+PUZZLE_INPUT = '793061'
+NUM_EXTRAS = 10
+# Recipes made between pattern checks
+BATCH_SIZE = 4096
 
-score = '37'
-elf1 = 0
-elf2 = 1
-while recipes not in score[-7:]:
-    score += str(int(score[elf1]) + int(score[elf2]))
-    elf1 = (elf1 + int(score[elf1]) + 1) % len(score)
-    elf2 = (elf2 + int(score[elf2]) + 1) % len(score)
 
-print('Part 1:', score[int(recipes):int(recipes)+10])
-print('Part 2:', score.index(recipes))
+class Scoreboard:
+    """
+    Recipe scores kept one digit per byte in a growing bytearray.
+
+    Both queries extend the board only as far as they need to, and
+    first_index matches the pattern against each new digit as it is
+    appended, so nothing already on the board is scanned twice.
+    """
+    def __init__(self, first_recipes: bytes = b'\x03\x07'):
+        self.recipes = bytearray(first_recipes)
+        self._elves = [0, 1]
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def next_ten(self, num_recipes: int) -> str:
+        """Return the scores of the ten recipes after the first num_recipes"""
+        self._make_recipes(num_recipes + NUM_EXTRAS)
+        return ''.join(str(score) for score in
+                       self.recipes[num_recipes:num_recipes + NUM_EXTRAS])
+
+    def first_index(self, pattern: str) -> int:
+        """Return the number of recipes before pattern first appears"""
+        target = [int(digit) for digit in pattern]
+        failure = _failure_table(target)
+        matched = 0
+        checked = 0
+        while True:
+            while checked < len(self.recipes):
+                score = self.recipes[checked]
+                while matched and target[matched] != score:
+                    matched = failure[matched - 1]
+                if target[matched] == score:
+                    matched += 1
+                checked += 1
+                if matched == len(target):
+                    return checked - len(target)
+            self._make_recipes(checked + BATCH_SIZE)
+
+    def _make_recipes(self, num_recipes: int):
+        """Make recipes until there are at least num_recipes"""
+        recipes = self.recipes
+        elf1, elf2 = self._elves
+        while len(recipes) < num_recipes:
+            total = recipes[elf1] + recipes[elf2]
+            if total >= 10:
+                recipes.append(1)
+                recipes.append(total - 10)
+            else:
+                recipes.append(total)
+            made = len(recipes)
+            elf1 += recipes[elf1] + 1
+            if elf1 >= made:
+                elf1 %= made
+            elf2 += recipes[elf2] + 1
+            if elf2 >= made:
+                elf2 %= made
+        self._elves = [elf1, elf2]
+
+
+def _failure_table(target: List[int]) -> List[int]:
+    """KMP table: failure[i] is the length of the longest proper prefix of
+    target[:i + 1] that is also a suffix of it"""
+    failure = [0] * len(target)
+    matched = 0
+    for i in range(1, len(target)):
+        while matched and target[i] != target[matched]:
+            matched = failure[matched - 1]
+        if target[i] == target[matched]:
+            matched += 1
+        failure[i] = matched
+    return failure
+
+
+if __name__ == '__main__':
+    recipes = argv[1] if len(argv) > 1 else PUZZLE_INPUT
+
+    print('Part 1:', Scoreboard().next_ten(int(recipes)))
+    print('Part 2:', Scoreboard().first_index(recipes))
@@ -1,13 +1,18 @@
 from sys import argv
 
-from battle import Battle
+from elf_power import find_min_elf_attack_power
+from grid_battle import GridBattle
 
 if __name__ == '__main__':
     data_file = argv[1]
     with open(data_file, 'r') as f_in:
-        battle = Battle(f_in)
+        battle_map = f_in.readlines()
+    battle = GridBattle(battle_map)
     battle.run()
-    # battle.print_metrics()
     print("WINNERS:", battle.winners)
     print("OUTCOME:", battle.outcome)
     battle.print_battle()
+
+    attack_power, outcome = find_min_elf_attack_power(battle_map)
+    print("ELF ATTACK POWER:", attack_power)
+    print("FLAWLESS OUTCOME:", outcome)
@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from grid_battle import GridBattle
+from team_unit import TeamUnit
+
+
+def flawless_outcome(battle_map: List[str],
+                     elf_attack_power: int) -> Optional[int]:
+    """Return the battle outcome if every elf survives, None otherwise."""
+    battle = GridBattle(battle_map, elf_attack_power=elf_attack_power,
+                        stop_on_elf_death=True)
+    battle.run()
+    return None if battle.elf_died else battle.outcome
+
+
+def find_min_elf_attack_power(battle_map: List[str],
+                              max_workers: Optional[int] = None) -> \
+        Tuple[int, int]:
+    """
+    Return the lowest elf attack power at which no elf dies, with its outcome.
+
+    Powers are doubled from the default until one wins flawlessly, then the
+    gap to the highest failing power is narrowed. Each step runs up to
+    max_workers candidate battles at once, every one aborting at the first
+    elf death.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    battle_map = [row.strip() for row in battle_map]
+    outcomes = {}   # type: Dict[int, Optional[int]]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        def probe(powers: List[int]):
+            results = executor.map(flawless_outcome,
+                                   [battle_map] * len(powers), powers)
+            outcomes.update(zip(powers, results))
+
+        # No attack power means no elf ever wins
+        low = 0
+        high = None
+        power = TeamUnit.ATTACK_POWER_E
+        while high is None:
+            if power > 2 * TeamUnit.MAX_HEALTH_G:
+                raise ValueError("No attack power keeps every elf alive")
+            powers = [power << i for i in range(max_workers)]
+            probe(powers)
+            winning = [p for p in powers if outcomes[p] is not None]
+            if winning:
+                high = min(winning)
+            low = max([low] + [p for p in powers
+                               if outcomes[p] is None and
+                               (high is None or p < high)])
+            power = powers[-1] << 1
+
+        while high - low > 1:
+            gap = high - low
+            count = min(max_workers, gap - 1)
+            powers = sorted({low + gap * (i + 1) // (count + 1)
+                             for i in range(count)})
+            probe(powers)
+            high = min([high] + [p for p in powers
+                                 if outcomes[p] is not None])
+            low = max([low] + [p for p in powers
+                               if outcomes[p] is None and p < high])
+
+    return high, outcomes[high]
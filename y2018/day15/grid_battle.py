@@ -0,0 +1,218 @@
+from typing import Iterable, List, Optional
+
+from cave import CaveSpot
+from team_unit import TeamUnit
+
+
+class GridUnit:
+    """A TeamUnit reduced to its team, health and integer cell index."""
+
+    def __init__(self, team: str, cell: int, attack_power: int):
+        self.team = team
+        self.cell = cell
+        self.attack_power = attack_power
+        self.health = (TeamUnit.MAX_HEALTH_E if team == TeamUnit.ELF
+                       else TeamUnit.MAX_HEALTH_G)
+
+    def __str__(self):
+        return "{}: {}".format(self.team, self.health)
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def is_dead(self) -> bool:
+        return self.health <= 0
+
+
+class GridBattle:
+    """
+    Same rules as Battle, played on a flat integer-indexed cave.
+
+    Cells are numbered in reading order, so sorting units by cell index is
+    turn order. Walls live in a bytearray and occupancy in a list of units
+    indexed by cell. Each turn runs one breadth-first search which yields
+    both the destination and the first step towards it.
+    """
+
+    def __init__(self, battle_map: Iterable[str],
+                 elf_attack_power: Optional[int] = None,
+                 goblin_attack_power: Optional[int] = None,
+                 stop_on_elf_death: bool = False):
+        self._attack_power = {
+            TeamUnit.ELF: (TeamUnit.ATTACK_POWER_E if elf_attack_power is None
+                           else elf_attack_power),
+            TeamUnit.GOBLIN: (TeamUnit.ATTACK_POWER_G
+                              if goblin_attack_power is None
+                              else goblin_attack_power),
+        }
+        self._width = 0
+        self._walls = bytearray()
+        self._units = []            # type: List[GridUnit]
+        self._load_battle(battle_map)
+        self._occupants = [None] * len(self._walls)  # type: List[Optional[GridUnit]]
+        for unit in self._units:
+            self._occupants[unit.cell] = unit
+        # Neighbour offsets in reading order: up, left, right, down
+        self._offsets = (-self._width, -1, 1, self._width)
+
+        self._stop_on_elf_death = stop_on_elf_death
+        self._elf_died = False
+
+        self._round_num = 0
+        self._battle_outcome = 0
+        self._winning_team = None   # type: Optional[str]
+
+    @property
+    def all_units(self) -> List[GridUnit]:
+        return self._units
+
+    @property
+    def ordered_units(self) -> List[GridUnit]:
+        return sorted(self._units, key=lambda u: u.cell)
+
+    @property
+    def rounds(self) -> int:
+        return self._round_num
+
+    @property
+    def outcome(self) -> int:
+        return self._battle_outcome
+
+    @property
+    def winners(self) -> str:
+        return self._winning_team
+
+    @property
+    def elf_died(self) -> bool:
+        return self._elf_died
+
+    def print_battle(self):
+        print("BATTLE:")
+        battle_map = [CaveSpot.WALL if wall else CaveSpot.FLOOR
+                      for wall in self._walls]
+        for unit in self._units:
+            if not unit.is_dead:
+                battle_map[unit.cell] = unit.team
+        rows = [''.join(battle_map[start: start + self._width])
+                for start in range(0, len(battle_map), self._width)]
+        print('\n'.join(rows))
+
+    #############
+    # - SETUP - #
+    #############
+    def _load_battle(self, battle_map: Iterable[str]):
+        for row in battle_map:
+            row = row.strip()
+            if not self._width:
+                self._width = len(row)
+            for point in row:
+                if point in TeamUnit.POSSIBLE_UNITS:
+                    self._units.append(GridUnit(point, len(self._walls),
+                                                self._attack_power[point]))
+                self._walls.append(point == CaveSpot.WALL)
+
+    ######################
+    # - RUN SIMULATION - #
+    ######################
+    def run(self, max_rounds: int = -1):
+        while True:
+            if 0 < max_rounds <= self._round_num:
+                return
+            for unit in self.ordered_units:
+                if unit.is_dead:
+                    continue
+                if not self._take_turn(unit):
+                    self._finish()
+                    return
+                if self._elf_died and self._stop_on_elf_death:
+                    return
+            self._units = [u for u in self._units if not u.is_dead]
+            self._round_num += 1
+
+    def _take_turn(self, unit: GridUnit) -> bool:
+        """Move and attack with unit. Return False if it has no targets left."""
+        if not any(not u.is_dead and u.team != unit.team
+                   for u in self._units):
+            return False
+        if self._adjacent_enemy(unit) is None:
+            step = self._find_step(unit)
+            if step is not None:
+                self._occupants[unit.cell] = None
+                self._occupants[step] = unit
+                unit.cell = step
+        target = self._adjacent_enemy(unit)
+        if target is not None:
+            target.health -= unit.attack_power
+            if target.is_dead:
+                self._occupants[target.cell] = None
+                self._elf_died |= target.team == TeamUnit.ELF
+        return True
+
+    def _adjacent_enemy(self, unit: GridUnit) -> Optional[GridUnit]:
+        """Return the weakest adjacent enemy, first in reading order on ties."""
+        target = None
+        for offset in self._offsets:
+            other = self._occupants[unit.cell + offset]
+            if (other is not None and other.team != unit.team and
+                    (target is None or other.health < target.health)):
+                target = other
+        return target
+
+    def _find_step(self, unit: GridUnit) -> Optional[int]:
+        """
+        Return the cell unit should step into, or None if no enemy is reachable.
+
+        Searches outward in layers from the open cells next to unit, labelling
+        each reached cell with the lowest first step that reaches it at its
+        shortest distance. The first layer holding a cell in range of an
+        enemy decides: its lowest cell is the destination, its label the step.
+        """
+        walls = self._walls
+        occupants = self._occupants
+        offsets = self._offsets
+        team = unit.team
+
+        first_steps = {}
+        layer = []
+        for offset in offsets:
+            cell = unit.cell + offset
+            if not walls[cell] and occupants[cell] is None:
+                first_steps[cell] = cell
+                layer.append(cell)
+
+        while layer:
+            in_range = [cell for cell in layer
+                        if self._next_to_enemy(cell, team)]
+            if in_range:
+                return first_steps[min(in_range)]
+            next_layer = []
+            next_cells = set()
+            for cell in layer:
+                step = first_steps[cell]
+                for offset in offsets:
+                    neighbour = cell + offset
+                    if walls[neighbour] or occupants[neighbour] is not None:
+                        continue
+                    known = first_steps.get(neighbour)
+                    if known is None:
+                        first_steps[neighbour] = step
+                        next_layer.append(neighbour)
+                        next_cells.add(neighbour)
+                    elif neighbour in next_cells and step < known:
+                        first_steps[neighbour] = step
+            layer = next_layer
+        return None
+
+    def _next_to_enemy(self, cell: int, team: str) -> bool:
+        for offset in self._offsets:
+            other = self._occupants[cell + offset]
+            if other is not None and other.team != team:
+                return True
+        return False
+
+    def _finish(self):
+        survivors = [u for u in self._units if not u.is_dead]
+        self._winning_team = survivors[0].team
+        self._battle_outcome = self._round_num * sum(u.health for u in survivors)
+        self._units = survivors
@@ -10,7 +10,7 @@ class TeamUnit:
     GOBLIN = "G"
     POSSIBLE_UNITS = {ELF, GOBLIN}
 
-    # 13 Attack power for all elves to survive
+    # See elf_power.find_min_elf_attack_power for the flawless elf power
     ATTACK_POWER_E = 3
     ATTACK_POWER_G = 3
     MAX_HEALTH_E = 200
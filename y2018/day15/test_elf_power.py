@@ -0,0 +1,29 @@
+import pytest
+
+from elf_power import find_min_elf_attack_power
+from test_grid_battle import SAMPLES
+# Need unit_health for fixture
+from test_helpers import using_health, unit_health
+
+
+class TestElfPower:
+    @using_health(health_e=200, health_g=200)
+    @pytest.mark.usefixtures("unit_health")
+    @pytest.mark.parametrize("sample_idx,expected", [
+        (0, (15, 4988)),
+        (2, (4, 31284)),
+        (3, (15, 3478)),
+        (4, (12, 6474)),
+        (5, (34, 1140)),
+    ])
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_find_min_elf_attack_power(self, sample_idx, expected,
+                                       max_workers):
+        # GIVEN
+        battle_map = SAMPLES[sample_idx][0]
+
+        # WHEN
+        result = find_min_elf_attack_power(battle_map, max_workers)
+
+        # THEN
+        assert result == expected
@@ -0,0 +1,116 @@
+import pytest
+
+from battle import Battle
+from grid_battle import GridBattle
+from team_unit import TeamUnit
+# Need unit_health for fixture
+from test_helpers import using_health, unit_health
+
+SAMPLES = [
+    (["#######",
+      "#.G...#",
+      "#...EG#",
+      "#.#.#G#",
+      "#..G#E#",
+      "#.....#",
+      "#######"], TeamUnit.GOBLIN, 27730),
+    (["#######",
+      "#G..#E#",
+      "#E#E.E#",
+      "#G.##.#",
+      "#...#E#",
+      "#...E.#",
+      "#######"], TeamUnit.ELF, 36334),
+    (["#######",
+      "#E..EG#",
+      "#.#G.E#",
+      "#E.##E#",
+      "#G..#.#",
+      "#..E#.#",
+      "#######"], TeamUnit.ELF, 39514),
+    (["#######",
+      "#E.G#.#",
+      "#.#G..#",
+      "#G.#.G#",
+      "#G..#.#",
+      "#...E.#",
+      "#######"], TeamUnit.GOBLIN, 27755),
+    (["#######",
+      "#.E...#",
+      "#.#..G#",
+      "#.###.#",
+      "#E#G#G#",
+      "#...#G#",
+      "#######"], TeamUnit.GOBLIN, 28944),
+    (["#########",
+      "#G......#",
+      "#.E.#...#",
+      "#..##..G#",
+      "#...##..#",
+      "#...#...#",
+      "#.G...G.#",
+      "#.....G.#",
+      "#########"], TeamUnit.GOBLIN, 18740),
+]
+
+
+class TestGridBattle:
+    @using_health(health_e=200, health_g=200)
+    @pytest.mark.usefixtures("unit_health")
+    @pytest.mark.parametrize("battle_map,winners,outcome", SAMPLES)
+    def test_samples(self, battle_map, winners, outcome):
+        # GIVEN
+        battle = GridBattle(battle_map)
+
+        # WHEN
+        battle.run()
+
+        # THEN
+        assert battle.winners == winners
+        assert battle.outcome == outcome
+
+    @using_health(health_e=200, health_g=200)
+    @pytest.mark.usefixtures("unit_health")
+    @pytest.mark.parametrize("max_rounds", [1, 2, 23, 28, 47])
+    def test_matches_battle_each_round(self, max_rounds):
+        # GIVEN
+        battle_map = SAMPLES[0][0]
+        battle = Battle(battle_map)
+        grid_battle = GridBattle(battle_map)
+
+        # WHEN
+        battle.run(max_rounds=max_rounds)
+        grid_battle.run(max_rounds=max_rounds)
+
+        # THEN
+        expected = [(u.team, u.health) for u in battle.ordered_units
+                    if not u.is_dead]
+        actual = [(u.team, u.health) for u in grid_battle.ordered_units]
+        assert actual == expected
+
+    @using_health(health_e=200, health_g=200)
+    @pytest.mark.usefixtures("unit_health")
+    def test_attack_power(self):
+        # GIVEN
+        battle = GridBattle(SAMPLES[0][0], elf_attack_power=15)
+
+        # WHEN
+        battle.run()
+
+        # THEN
+        assert battle.winners == TeamUnit.ELF
+        assert battle.outcome == 4988
+
+    @using_health(health_e=200, health_g=200)
+    @pytest.mark.usefixtures("unit_health")
+    def test_stop_on_elf_death(self):
+        # GIVEN
+        battle = GridBattle(SAMPLES[0][0], stop_on_elf_death=True)
+
+        # WHEN
+        battle.run()
+
+        # THEN
+        assert battle.elf_died
+        assert battle.winners is None
+        assert battle.outcome == 0
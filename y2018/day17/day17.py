@@ -8,11 +8,8 @@ if __name__ == '__main__':
     data = [line.strip() for line in open(data_file, "r").readlines()]
     cm = ClayMap(data)
     seepage = Seepage(cm)
-    try:
-        seepage.run()
-        print(f"Water seeps to {seepage.water_volume} spaces")
-        # print(f"Standing water fills {seepage.standing_water_volume} spaces")
-        seepage.print_metrics()
-    except AssertionError:
-        pass
+    seepage.run()
+    print(f"Water seeps to {seepage.water_volume} spaces")
+    print(f"Standing water fills {seepage.standing_water_volume} spaces")
+    seepage.print_metrics()
     open('output.out', 'w').write(str(seepage))
@@ -0,0 +1,36 @@
+from hashlib import blake2b
+from typing import Dict, Optional, Tuple
+
+
+class CycleDetector:
+    """
+    Find the period of a deterministic sequence of states.
+
+    Only a digest -> generation map is kept. When a digest repeats, the
+    state is held on to for one period and compared byte for byte with the
+    state a full period later, so a digest collision can never be mistaken
+    for a cycle.
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(self):
+        self._seen = {}         # type: Dict[bytes, int]
+        # (generation, state, period) awaiting confirmation
+        self._candidate = None  # type: Optional[Tuple[int, bytes, int]]
+
+    def record(self, generation: int, state: bytes) -> Optional[int]:
+        """Record the state after generation and return the period once confirmed."""
+        if self._candidate is not None:
+            candidate_gen, candidate_state, period = self._candidate
+            if generation == candidate_gen + period:
+                if state == candidate_state:
+                    return period
+                self._candidate = None
+
+        digest = blake2b(state, digest_size=self.DIGEST_SIZE).digest()
+        last_seen = self._seen.get(digest)
+        if last_seen is not None and self._candidate is None:
+            self._candidate = (generation, state, generation - last_seen)
+        self._seen[digest] = generation
+        return None
@@ -46,4 +46,21 @@ class LumberCollection:
                     # S
                     acre.neighbors.add(self.collection_area[i + row_len])
 
+    def update(self):
+        for acre in self.collection_area:
+            acre.calc_next_type()
+        for acre in self.collection_area:
+            acre.update_type()
 
+    def state_bytes(self) -> bytes:
+        return bytes(a.type for a in self.collection_area)
+
+    def resource_value(self) -> int:
+        lumber_yards = 0
+        wooded_acres = 0
+        for acre in self.collection_area:
+            if acre.type == Acre.LUMBER:
+                lumber_yards += 1
+            elif acre.type == Acre.WOODED:
+                wooded_acres += 1
+        return wooded_acres * lumber_yards
@@ -0,0 +1,57 @@
+from typing import List
+
+import numpy as np
+
+from acre import Acre
+
+
+class LumberGrid:
+    """
+    LumberCollection held as one int16 array of Acre types.
+
+    Each generation sums the eight neighbours of every acre from shifted
+    views of a zero-padded copy of the grid, then looks up every next type
+    at once in a table built from Acre.ALL_OUTCOMES.
+    """
+
+    # Largest environment: eight wooded neighbours
+    MAX_ENVIRONMENT = 8 * Acre.WOODED
+
+    def __init__(self, area_map: List[str]):
+        self.grid = np.array([[Acre.TYPE_FOR_SYMBOL[acre] for acre in row]
+                              for row in area_map], dtype=np.int16)
+        num_rows, row_len = self.grid.shape
+        self._padded = np.zeros((num_rows + 2, row_len + 2), dtype=np.int16)
+        self._outcomes = self._outcome_table()
+
+    @classmethod
+    def _outcome_table(cls) -> np.ndarray:
+        Acre.calc_all_outcomes()
+        table = np.zeros((Acre.WOODED + 1, cls.MAX_ENVIRONMENT + 1),
+                         dtype=np.int16)
+        for acre_type, outcomes in Acre.ALL_OUTCOMES.items():
+            for environment, next_type in outcomes.items():
+                table[acre_type, environment] = next_type
+        return table
+
+    def update(self):
+        padded = self._padded
+        padded[1:-1, 1:-1] = self.grid
+        num_rows, row_len = self.grid.shape
+        environment = (padded[:num_rows, :row_len] +
+                       padded[:num_rows, 1:row_len + 1] +
+                       padded[:num_rows, 2:] +
+                       padded[1:num_rows + 1, :row_len] +
+                       padded[1:num_rows + 1, 2:] +
+                       padded[2:, :row_len] +
+                       padded[2:, 1:row_len + 1] +
+                       padded[2:, 2:])
+        self.grid = self._outcomes[self.grid, environment]
+
+    def state_bytes(self) -> bytes:
+        return self.grid.tobytes()
+
+    def resource_value(self) -> int:
+        lumber_yards = np.count_nonzero(self.grid == Acre.LUMBER)
+        wooded_acres = np.count_nonzero(self.grid == Acre.WOODED)
+        return int(lumber_yards * wooded_acres)
@@ -1,7 +1,7 @@
 import re
 import sys
-from collections import namedtuple
-from typing import List, Dict
+from collections import defaultdict, deque, namedtuple
+from typing import List, Dict, Set
 
 SPLIT = '|'
 OPEN = '('
@@ -189,10 +189,91 @@ class Explorer:
             self._journal[self._cur_pos] = cur_dist + 1
 
 
+################################
+# ----- COMPILE TO GRAPH ----- #
+################################
+# Compile directions to a graph of rooms in one pass, then measure it once
+STEPS = {'N': (-1, 0), 'S': (1, 0), 'W': (0, -1), 'E': (0, 1)}
+
+
+class MapExplorer:
+    """Explorer with the same interface that reads directions only once.
+
+    A stack of branch start positions replaces the substring scanning, so
+    compiling is linear in the length of the directions. A single BFS then
+    gives every room's distance, and a histogram of those distances answers
+    rooms_for_dist for any threshold."""
+    def __init__(self):
+        self._doors = defaultdict(set)  # type: Dict[Position, Set[Position]]
+        self._journal = {}  # type: Dict[Position, int]
+        # _rooms_at_least[d] is the number of rooms d or more doors away
+        self._rooms_at_least = []  # type: List[int]
+
+    @property
+    def journal(self) -> Dict[Position, int]:
+        return self._journal
+
+    @property
+    def max_distance(self) -> int:
+        return len(self._rooms_at_least) - 1
+
+    def rooms_for_dist(self, distance: int) -> int:
+        """Return the number of rooms that are at least
+        distance number of spaces away from (0, 0)"""
+        if distance >= len(self._rooms_at_least):
+            return 0
+        return self._rooms_at_least[max(distance, 0)]
+
+    def explore_cave(self, directions: str):
+        self._compile(directions)
+        self._measure()
+
+    def _compile(self, directions: str):
+        """Record a door for every step, returning to the start of a
+        group at each SPLIT and CLOSE"""
+        cur_pos = Position(0, 0)
+        self._doors[cur_pos] = set()
+        branch_starts = []  # type: List[Position]
+        for symbol in directions:
+            if symbol in STEPS:
+                d_row, d_col = STEPS[symbol]
+                next_pos = Position(cur_pos.row + d_row, cur_pos.col + d_col)
+                self._doors[cur_pos].add(next_pos)
+                self._doors[next_pos].add(cur_pos)
+                cur_pos = next_pos
+            elif symbol == OPEN:
+                branch_starts.append(cur_pos)
+            elif symbol == SPLIT:
+                cur_pos = branch_starts[-1]
+            elif symbol == CLOSE and branch_starts:
+                cur_pos = branch_starts.pop()
+
+    def _measure(self):
+        """Find every room's distance and the rooms at or beyond each distance"""
+        start = Position(0, 0)
+        self._journal = {start: 0}
+        room_counts = [1]
+        to_visit = deque([start])
+        while to_visit:
+            pos = to_visit.popleft()
+            dist = self._journal[pos] + 1
+            for next_pos in self._doors[pos]:
+                if next_pos not in self._journal:
+                    self._journal[next_pos] = dist
+                    if dist == len(room_counts):
+                        room_counts.append(0)
+                    room_counts[dist] += 1
+                    to_visit.append(next_pos)
+
+        self._rooms_at_least = room_counts
+        for dist in range(len(room_counts) - 2, -1, -1):
+            self._rooms_at_least[dist] += self._rooms_at_least[dist + 1]
+
+
 if __name__ == '__main__':
     data_file = sys.argv[1]
     data = open(data_file, 'r').read().strip()
-    e = Explorer()
+    e = MapExplorer()
     e.explore_cave(data)
     print(f"Farthest room is {e.max_distance} units away from start")
     if len(sys.argv) > 2:
@@ -1,9 +1,11 @@
 from unittest import TestCase
 
-from day20 import Explorer, Position
+from day20 import Explorer, MapExplorer, Position
 
 
 class TestExplorer(TestCase):
+    explorer_class = Explorer
+
     def test_explore_one_path(self):
         directions = '(NE)'
         expected_journal = {
@@ -11,7 +13,7 @@ class TestExplorer(TestCase):
             Position(-1, 0): 1,
             Position(-1, 1): 2,
         }
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertDictEqual(expected_journal, e.journal)
@@ -26,7 +28,7 @@ class TestExplorer(TestCase):
             Position(0, 2): 2,
             Position(0, -1): 1
         }
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertDictEqual(expected_journal, e.journal)
@@ -42,7 +44,7 @@ class TestExplorer(TestCase):
             Position(-1, 2): 3,
             Position(-1, -1): 2
         }
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertDictEqual(expected_journal, e.journal)
@@ -61,13 +63,13 @@ class TestExplorer(TestCase):
             Position(-2, 2): 4,
             Position(-2, 3): 5
         }
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertDictEqual(expected_journal, e.journal)
 
     def max_distance_check(self, directions: str, expected_distance: int):
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertEqual(expected_distance, e.max_distance)
@@ -99,7 +101,7 @@ class TestExplorer(TestCase):
 
     def rooms_for_dist_check(self, directions: str, target_distance: int,
                              expected_num_rooms: int):
-        e = Explorer()
+        e = self.explorer_class()
         e.explore_cave(directions)
 
         self.assertEqual(expected_num_rooms, e.rooms_for_dist(target_distance))
@@ -117,3 +119,12 @@ class TestExplorer(TestCase):
         expected_num_rooms = 4
         self.rooms_for_dist_check(directions, target_distance,
                                   expected_num_rooms)
+
+
+class TestMapExplorer(TestExplorer):
+    explorer_class = MapExplorer
+
+    def test_rooms_for_dist_beyond_max(self):
+        directions = '^N(E|NE|W)$'
+        self.rooms_for_dist_check(directions, 4, 0)
+        self.rooms_for_dist_check(directions, 0, 6)
@@ -3,13 +3,14 @@ Defaults to using data_test.txt for input data.
 Use flag --live-run to use 'real' data.
 """
 import argparse
+import functools
 import pathlib
 import sys
 from typing import List
 
 sys.path.append(str(pathlib.Path(__file__).absolute().parent.parent))
 
-from intcode.intcode3 import Computer
+from intcode import Computer, SweepCase, sweep
 
 
 def solve(data: List[int], day_num: int, live_run: bool = True) -> str:
@@ -26,16 +27,23 @@ def solve(data: List[int], day_num: int, live_run: bool = True) -> str:
         if live_run:
             goal = 19690720
             init_value_range = (0, 100)
-            for noun in range(*init_value_range):
-                for verb in range(*init_value_range):
-                    computer.initialize({1: noun, 2: verb})
-                    computer.run()
-                    if computer.dump()[0] == goal:
-                        return str(100 * noun + verb)
+            cases = [
+                SweepCase(patch={1: noun, 2: verb})
+                for noun in range(*init_value_range)
+                for verb in range(*init_value_range)
+            ]
+            match = sweep(data, cases, functools.partial(first_value_is, goal), precompile=False)
+            if match is not None:
+                patch = cases[match].patch
+                return str(100 * patch[1] + patch[2])
         else:
             return "No test run available"
 
 
+def first_value_is(goal: int, computer: Computer) -> bool:
+    return computer.dump()[0] == goal
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--live-run", action="store_true")
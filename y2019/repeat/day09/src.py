@@ -5,24 +5,22 @@ from typing import List
 
 sys.path.append(str(pathlib.Path(__file__).absolute().parent.parent))
 
-from intcode.intcode4 import Computer
+from intcode import BufferPort, Computer
 
 
 def solve(data: List[int], day_num: int) -> int:
     computer = Computer(
         data,
-        io_src=Computer.MEMBUF_IO_SRC,
-        io_dest=Computer.MEMBUF_IO_DEST,
+        input_port=BufferPort([day_num]),
+        output_port=BufferPort(),
+        precompile=True,
     )
-    computer.add_input(day_num)
     result = computer.run()
 
     # Print out any erroring opcodes
-    output_buffer = computer.get_output_buffer()
-    next_output = output_buffer.popleft()
-    while output_buffer:
-        print(next_output)
-        next_output = output_buffer.popleft()
+    *erroring_opcodes, next_output = computer.output_port.drain()
+    for opcode in erroring_opcodes:
+        print(opcode)
 
     if result:
         return -1
@@ -88,14 +88,14 @@ class Robot:
     def display_painting(self):
         print(self._canvas)
 
-    def get_input(self) -> int:
+    def read(self) -> int:
         """
         Return the integer corresponding to the color
         of self._canvas at self._position.
         """
         return self._canvas.get_value(self._position)
 
-    def add_output(self, value: int):
+    def write(self, value: int):
         """
         Receive output from computer and update
         self._canvas or self._direction.
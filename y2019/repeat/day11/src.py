@@ -6,7 +6,7 @@ from typing import List
 sys.path.append(str(pathlib.Path(__file__).absolute().parent.parent))
 
 from day11.robot import Robot
-from intcode.intcode5 import Computer
+from intcode import Computer
 
 
 def solve(data: List[int], day_num: int) -> int:
@@ -16,10 +16,8 @@ def solve(data: List[int], day_num: int) -> int:
         robot = Robot()
     computer = Computer(
         data,
-        io_src_type=Computer.OBJECT_IO_SRC,
-        io_dest_type=Computer.OBJECT_IO_DEST,
-        custom_input_src=robot,
-        custom_output_dest=robot,
+        input_port=robot,
+        output_port=robot,
     )
     result = computer.run()
 
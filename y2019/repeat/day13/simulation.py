@@ -1,7 +1,6 @@
-from collections import deque
 from typing import Optional
 
-from intcode.intcode5 import Computer
+from intcode import Computer, RingOutputPort
 
 
 class GameScreen:
@@ -84,8 +83,7 @@ class Simulation:
     }
 
     def __init__(self):
-        self.input_buffer = deque()
-        self.output_buffer = deque()
+        self.output_port = RingOutputPort()
         self.computer = self.setup_computer()
 
         self.game_screen = GameScreen()
@@ -96,22 +94,27 @@ class Simulation:
             data = [int(val) for val in f_in.read().strip().split(",")]
         computer = Computer(
             data,
-            io_src_type=Computer.OBJECT_IO_SRC,
-            io_dest_type=Computer.OBJECT_IO_DEST,
-            custom_input_src=self,
-            custom_output_dest=self,
+            input_port=self,
+            output_port=self.output_port,
         )
         computer.initialize({0: 2})
         return computer
 
     def run(self) -> int:
-        return self.computer.run()
-
-    def add_output(self, output_val: int):
-        pixel_value = self.state.update(output_val)
-        if pixel_value is not None:
-            self.game_screen.set_pixel(self.state.x, self.state.y, pixel_value)
-            self.game_screen.display(self.state.score)
-
-    def get_input(self) -> int:
+        result = self.computer.run()
+        self.update_screen()
+        return result
+
+    def update_screen(self):
+        """Apply every output since the last update, then redraw once."""
+        for view in self.output_port.views():
+            for output_val in view:
+                pixel_value = self.state.update(output_val)
+                if pixel_value is not None:
+                    self.game_screen.set_pixel(self.state.x, self.state.y, pixel_value)
+        self.output_port.consume(len(self.output_port))
+        self.game_screen.display(self.state.score)
+
+    def read(self) -> int:
+        self.update_screen()
         return Simulation.JOYSTICK[input()]
@@ -5,17 +5,17 @@ from typing import List
 
 sys.path.append(str(pathlib.Path(__file__).absolute().parent.parent))
 
-from intcode.intcode5 import Computer
+from intcode import Computer, RingOutputPort
 from simulation import GameScreen, Simulation
 
 
 def solve(data: List[int], day_num: int) -> int:
     if day_num == 1:
-        output_buffer = []
-        computer = Computer(data, io_dest_type=Computer.MEMBUF_IO_DEST, custom_output_dest=output_buffer)
+        output_port = RingOutputPort()
+        computer = Computer(data, output_port=output_port)
         computer.run()
         block_count = 0
-        for value in output_buffer[2::3]:
+        for value in output_port.drain()[2::3]:
             if value == GameScreen.VALUE_TYPE_BLOCK:
                 block_count += 1
         return block_count
@@ -0,0 +1,16 @@
+"""
+Intcode computer for the 2019 puzzles.
+
+intcode1 - intcode4 are the earlier interpreter generations, kept for
+reference. intcode5 holds the current Computer, which covers each earlier
+generation through its feature_level argument. The rest of the package is
+built around it: ports for its input and output, memory for its paged
+memory, profiler for profile=True runs, network for connecting several
+Computers and sweeps for running many variants of one program.
+"""
+from .intcode5 import Computer, ComputerSnapshot, UnknownMode, UnknownOpCode
+from .memory import PagedMemory
+from .network import Network, NetworkDeadlock
+from .ports import BufferPort, EmptyInput, InputPort, OutputPort, RingOutputPort, StdinPort, StdoutPort
+from .profiler import Profiler
+from .sweeps import SweepCase, sweep
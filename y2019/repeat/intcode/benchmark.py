@@ -0,0 +1,164 @@
+"""
+Benchmark every engine of the Intcode Computer against the saved 2019 programs.
+
+Run from y2019/repeat:
+    python -m intcode.benchmark [--json results.json] [--baseline results.json]
+
+Each (program, engine) pair runs in a fresh process so its peak RSS is its own.
+With --baseline, exits non-zero when any pair's steps/sec drops by more than
+--tolerance compared to the saved results.
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .intcode5 import Computer
+from .ports import BufferPort, EmptyInput
+
+SAVED_DIR = Path(__file__).absolute().parent.parent.parent / "saved"
+
+ENGINES = {
+    "interpreted": {"precompile": False},
+    "precompiled": {"precompile": True},
+}
+
+
+class ConstantPort:
+    """Input port answering every read with the same value."""
+
+    def __init__(self, value: int):
+        self._value = value
+
+    def read(self) -> int:
+        return self._value
+
+
+class BenchmarkCase:
+    def __init__(
+            self,
+            name: str,
+            day: int,
+            patch: Optional[Dict[int, int]] = None,
+            inputs: Optional[List[int]] = None,
+            constant_input: Optional[int] = None,
+    ):
+        self.name = name
+        self.day = day
+        self.patch = {} if patch is None else patch
+        self.inputs = [] if inputs is None else inputs
+        self.constant_input = constant_input
+
+    def load_code(self) -> List[int]:
+        data_file = SAVED_DIR / f"day{self.day:02}" / f"data{self.day:02}.txt"
+        return [int(val) for val in data_file.read_text().strip().split(",")]
+
+    def input_port(self):
+        if self.constant_input is not None:
+            return ConstantPort(self.constant_input)
+        return BufferPort(self.inputs)
+
+
+CASES = [
+    BenchmarkCase("day02", 2, patch={1: 12, 2: 2}),
+    BenchmarkCase("day05-part1", 5, inputs=[1]),
+    BenchmarkCase("day05-part2", 5, inputs=[5]),
+    BenchmarkCase("day07-amplifier", 7, inputs=[4, 0]),
+    BenchmarkCase("day09-part1", 9, inputs=[1]),
+    BenchmarkCase("day09-part2", 9, inputs=[2]),
+    # Every panel reads as black
+    BenchmarkCase("day11-robot", 11, constant_input=0),
+    BenchmarkCase("day13-part1", 13),
+    # Joystick held in neutral until the ball is lost
+    BenchmarkCase("day13-part2", 13, patch={0: 2}, constant_input=0),
+    # Fixed walk that ends when the moves run out
+    BenchmarkCase("day15-droid", 15, inputs=[(i * 7 + i // 3) % 4 + 1 for i in range(5000)]),
+    BenchmarkCase("day17-part1", 17),
+]
+
+
+def measure(case_name: str, engine: str) -> Dict:
+    """Run one case on one engine in this process and return its metrics."""
+    case = next(case for case in CASES if case.name == case_name)
+    computer = Computer(case.load_code(), input_port=case.input_port(), output_port=BufferPort(), **ENGINES[engine])
+    computer.initialize(case.patch)
+    start = time.perf_counter()
+    try:
+        computer.run()
+    except EmptyInput:
+        pass
+    seconds = time.perf_counter() - start
+    return {
+        "case": case.name,
+        "engine": engine,
+        "steps": computer.steps,
+        "seconds": seconds,
+        "steps_per_sec": computer.steps / seconds if seconds else 0.0,
+        # Kilobytes on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_benchmarks(case_names: List[str], engines: List[str], repeat: int = 1) -> List[Dict]:
+    """Measure each case on each engine in its own process, keeping the fastest of repeat runs."""
+    results = []
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1) as executor:
+        for case_name in case_names:
+            for engine in engines:
+                runs = [executor.submit(measure, case_name, engine).result() for _ in range(repeat)]
+                results.append(max(runs, key=lambda run: run["steps_per_sec"]))
+    return results
+
+
+def find_regressions(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    previous = {(run["case"], run["engine"]): run for run in baseline}
+    regressions = []
+    for run in results:
+        old = previous.get((run["case"], run["engine"]))
+        if old is not None and run["steps_per_sec"] < old["steps_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{run['case']} [{run['engine']}]: "
+                f"{old['steps_per_sec']:,.0f} -> {run['steps_per_sec']:,.0f} steps/sec"
+            )
+    return regressions
+
+
+def format_results(results: List[Dict]) -> str:
+    lines = [f"{'CASE':<18}{'ENGINE':<14}{'STEPS':>10}{'STEPS/SEC':>14}{'PEAK RSS KB':>14}"]
+    for run in results:
+        lines.append(
+            f"{run['case']:<18}{run['engine']:<14}{run['steps']:>10}"
+            f"{run['steps_per_sec']:>14,.0f}{run['peak_rss_kb']:>14}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", nargs="+", default=[case.name for case in CASES])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="Save results to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.cases, args.engines, args.repeat)
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
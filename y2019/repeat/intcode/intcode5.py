@@ -1,6 +1,11 @@
 """Implementation for Day 9 - Add Relative Mode and relative offset"""
-from collections import deque
-from typing import List, Dict, Tuple, Optional, Deque
+from copy import copy
+from itertools import count
+from typing import List, Dict, Tuple, Optional, Callable
+
+from .memory import PagedMemory
+from .ports import InputPort, OutputPort, StdinPort, StdoutPort
+from .profiler import Profiler
 
 
 class UnknownOpCode(Exception):
@@ -13,18 +18,115 @@ class UnknownMode(Exception):
         super().__init__(mode)
 
 
-class UnknownIOSource(Exception):
-    def __init__(self, source: str):
-        super().__init__(source)
-
+class ComputerSnapshot:
+    """
+    Saved execution state of a Computer.
 
-class UnknownIODestination(Exception):
-    def __init__(self, destination: str):
-        super().__init__(destination)
+    Memory is held as a copy-on-write clone, so taking a snapshot does not
+    copy any memory. A snapshot can be restored any number of times.
+    """
 
-
-class EmptyInput(Exception):
-    pass
+    def __init__(
+            self,
+            memory: PagedMemory,
+            instruction_pointer: int,
+            relative_base: int,
+            input_port: InputPort,
+            output_port: OutputPort,
+            input_history: List[int],
+            output_history: List[int],
+    ):
+        self.memory = memory
+        self.instruction_pointer = instruction_pointer
+        self.relative_base = relative_base
+        self.input_port = input_port
+        self.output_port = output_port
+        self.input_history = input_history
+        self.output_history = output_history
+
+
+# How a precompiled handler finds an operand: the parameter itself, a fixed
+# address inside or beyond the code segment, an address only known when the
+# instruction runs, or an address relative to the relative base
+IMMEDIATE_OPERAND, CODE_OPERAND, PAGE_OPERAND, DYNAMIC_OPERAND, RELATIVE_OPERAND = range(5)
+
+
+def _operand_source(kind: int, param: str, slot: int) -> str:
+    if kind == IMMEDIATE_OPERAND:
+        return param
+    if kind == CODE_OPERAND:
+        return f"code[{param}]"
+    if kind == PAGE_OPERAND:
+        return f"read({param})"
+    if kind == RELATIVE_OPERAND:
+        param = f"computer._relative_base + {param}"
+    return f"(code[r{slot}] if (r{slot} := {param}) < size else read(r{slot}))"
+
+
+def _store_source(kind: int, param: str, value: str) -> List[str]:
+    if kind == CODE_OPERAND:
+        lines = [f"code[{param}] = {value}"]
+    elif kind == PAGE_OPERAND:
+        lines = [f"write({param}, {value})"]
+    else:
+        if kind == RELATIVE_OPERAND:
+            param = f"computer._relative_base + {param}"
+        lines = [
+            f"value = {value}",
+            f"target = {param}",
+            "if target < size:",
+            "    code[target] = value",
+            "else:",
+            "    write(target, value)",
+        ]
+        param = "target"
+    # Writes that land on a decoded instruction drop its handler
+    return lines + [f"if {param} in compiled:", f"    invalidate({param})"]
+
+
+def _handler_source(opcode: int, kinds: Tuple[int, ...], live_params: bool) -> str:
+    """
+    Return the source of a function that binds a handler for opcode, with
+    each operand read inline according to its kind.
+
+    The bound parameters p0-p2 are the instruction's parameters, or with
+    live_params the addresses of them, to be read every time it runs.
+    """
+    params = [f"code[p{i}]" if live_params else f"p{i}" for i in range(len(kinds))]
+    operands = [_operand_source(kind, param, i) for i, (kind, param) in enumerate(zip(kinds, params))]
+    if opcode in (Computer.ADD, Computer.MULTIPLY, Computer.LESS_THAN, Computer.EQUALS):
+        first, second = operands[:2]
+        value = {
+            Computer.ADD: f"{first} + {second}",
+            Computer.MULTIPLY: f"{first} * {second}",
+            Computer.LESS_THAN: f"1 if {first} < {second} else 0",
+            Computer.EQUALS: f"1 if {first} == {second} else 0",
+        }[opcode]
+        body = _store_source(kinds[2], params[2], value) + ["return next_address"]
+    elif opcode == Computer.INPUT:
+        body = (
+            ["ipt = read_input()"]
+            + _store_source(kinds[0], params[0], "ipt")
+            + ["input_history.append(ipt)", "return next_address"]
+        )
+    elif opcode == Computer.OUTPUT:
+        body = [f"value = {operands[0]}", "output_history.append(value)", "write_output(value)", "return next_address"]
+    elif opcode == Computer.JUMP_IF_TRUE:
+        body = [f"return {operands[1]} if {operands[0]} != 0 else next_address"]
+    elif opcode == Computer.JUMP_IF_FALSE:
+        body = [f"return {operands[1]} if {operands[0]} == 0 else next_address"]
+    else:
+        body = [f"computer._relative_base += {operands[0]}", "return next_address"]
+    return "\n".join(
+        [
+            "def bind(computer, code, size, read, write, compiled, invalidate,",
+            "         read_input, write_output, input_history, output_history,",
+            "         p0, p1, p2, next_address):",
+            "    def handler():",
+        ]
+        + [f"        {line}" for line in body]
+        + ["    return handler"]
+    )
 
 
 class Computer:
@@ -56,40 +158,83 @@ class Computer:
         EQUALS: 4,
         REL_BASE_OFFSET: 2,
     }
+    MAX_POINTER_OFFSET = max(POINTER_OFFSET.values())
+
+    # Names the profiler reports each instruction under
+    OPCODE_NAMES = {
+        ADD: "ADD",
+        MULTIPLY: "MULTIPLY",
+        INPUT: "INPUT",
+        OUTPUT: "OUTPUT",
+        JUMP_IF_TRUE: "JUMP_IF_TRUE",
+        JUMP_IF_FALSE: "JUMP_IF_FALSE",
+        LESS_THAN: "LESS_THAN",
+        EQUALS: "EQUALS",
+        REL_BASE_OFFSET: "REL_BASE_OFFSET",
+    }
 
     HALT = 99
 
-    # Read from/write to stdin/stdout
-    STDIN_IO_SRC = "stdin"
-    STDOUT_IO_DEST = "stdout"
-    # Maintain in-memory queue
-    MEMBUF_IO_SRC = "mem_src"
-    MEMBUF_IO_DEST = "mem_dest"
-    # Interact with injected object dependency
-    OBJECT_IO_SRC = "obj_src"
-    OBJECT_IO_DEST = "obj_dest"
+    # Instructions and parameter modes of each interpreter generation
+    FEATURE_LEVELS = {
+        # Day 2
+        1: ({ADD, MULTIPLY}, {POSITION_MODE}),
+        # Days 5 and 7
+        2: ({ADD, MULTIPLY, INPUT, OUTPUT, JUMP_IF_TRUE, JUMP_IF_FALSE, LESS_THAN, EQUALS},
+            {POSITION_MODE, IMMEDIATE_MODE}),
+        # Day 9 onwards
+        3: (set(POINTER_OFFSET), {POSITION_MODE, IMMEDIATE_MODE, RELATIVE_MODE}),
+    }
+    LATEST_FEATURE_LEVEL = max(FEATURE_LEVELS)
+
+    # Runs through the interpreter before an instruction gets a specialised handler
+    HOT_THRESHOLD = 8
+
+    # Handler binders generated so far, by (opcode, operand kinds, live parameters)
+    _HANDLER_BINDERS = {}  # type: Dict[Tuple[int, Tuple[int, ...], bool], Callable]
 
     def __init__(
             self,
             code: List[int],
             identifier: str = "X",
-            io_src_type: str = STDIN_IO_SRC,
-            io_dest_type: str = STDOUT_IO_DEST,
-            custom_input_src: Optional = None,
-            custom_output_dest: Optional = None,
+            input_port: Optional[InputPort] = None,
+            output_port: Optional[OutputPort] = None,
             debug: bool = False,
+            precompile: bool = False,
+            profile: bool = False,
+            profile_path: Optional[str] = None,
+            feature_level: int = LATEST_FEATURE_LEVEL,
     ):
         self._id = identifier
         self._instruction_pointer = 0
         self._relative_base = 0
+        self._steps = 0
         self._code = code
-        self._memory = []
+        self._memory = PagedMemory([])
+        # Decoded instruction handlers, keyed by instruction address
+        self._precompile = precompile
+        # Restrict to an earlier generation's instruction set, None when everything is allowed
+        self._feature_limits = (
+            None if feature_level == Computer.LATEST_FEATURE_LEVEL else Computer.FEATURE_LEVELS[feature_level]
+        )
+        self._handlers = {}  # type: Dict[int, Callable[[], int]]
+        # Cells each handler was decoded from, starting at its address
+        self._handler_sizes = {}  # type: Dict[int, int]
+        self._compiled_cells = set()
+        # Code segment the handlers write to
+        self._handler_code = None  # type: Optional[List[int]]
+        # Instructions run often enough to be worth specialising
+        self._hot_addresses = set()
+        # Instructions whose parameters the program rewrites while running
+        self._live_param_addresses = set()
         self.initialize({})  # Copy over initial code
-        self._io_src_type = io_src_type
-        self._io_dest_type = io_dest_type
         self._debug = debug
-        self._input_src = deque() if custom_input_src is None else custom_input_src
-        self._output_dest = deque() if custom_output_dest is None else custom_output_dest
+        self._profiler = self._new_profiler() if profile or profile_path else None
+        self._profile_path = profile_path
+        self._bind_ports(
+            StdinPort() if input_port is None else input_port,
+            StdoutPort() if output_port is None else output_port,
+        )
         self._input_history = []
         self._output_history = []
 
@@ -97,6 +242,27 @@ class Computer:
     def id(self) -> str:
         return self._id
 
+    @property
+    def steps(self) -> int:
+        """Number of instructions executed so far."""
+        return self._steps
+
+    @property
+    def resident_pages(self) -> int:
+        return self._memory.resident_pages
+
+    @property
+    def profiler(self) -> Optional[Profiler]:
+        return self._profiler
+
+    @property
+    def input_port(self) -> InputPort:
+        return self._input_port
+
+    @property
+    def output_port(self) -> OutputPort:
+        return self._output_port
+
     @property
     def input_history(self) -> List[int]:
         return [val for val in self._input_history]
@@ -113,37 +279,95 @@ class Computer:
         """
         self._instruction_pointer = 0
         self._relative_base = 0
-        self._memory = [val for val in self._code]
+        self._memory = PagedMemory(self._code)
+        self._clear_handlers()
         for index, value in init_values.items():
             self._set_value(value, index)
 
-    def set_input_buffer(self, input_buffer: Deque):
-        self._input_src = input_buffer
-
-    def set_output_buffer(self, output_buffer: Deque):
-        self._output_dest = output_buffer
+    def snapshot(self) -> ComputerSnapshot:
+        """
+        Capture memory, instruction pointer, relative base and I/O state.
 
-    def get_input_buffer(self) -> Deque:
-        return self._input_src
+        Ports with a copy() method, such as BufferPort, are copied. Any
+        other port is shared with the snapshot as-is.
+        """
+        return ComputerSnapshot(
+            memory=self._memory.clone(),
+            instruction_pointer=self._instruction_pointer,
+            relative_base=self._relative_base,
+            input_port=self._copy_port(self._input_port),
+            output_port=self._copy_port(self._output_port),
+            input_history=[val for val in self._input_history],
+            output_history=[val for val in self._output_history],
+        )
+
+    def restore(self, snapshot: ComputerSnapshot):
+        """Return this computer to the state captured in snapshot."""
+        self._memory = snapshot.memory.clone()
+        self._instruction_pointer = snapshot.instruction_pointer
+        self._relative_base = snapshot.relative_base
+        self._input_history = [val for val in snapshot.input_history]
+        self._output_history = [val for val in snapshot.output_history]
+        self._bind_ports(self._copy_port(snapshot.input_port), self._copy_port(snapshot.output_port))
+
+    @staticmethod
+    def _new_profiler() -> Profiler:
+        jumps = (Computer.JUMP_IF_TRUE, Computer.JUMP_IF_FALSE)
+        return Profiler(Computer.OPCODE_NAMES, {opcode: Computer.POINTER_OFFSET[opcode] for opcode in jumps})
+
+    def fork(self, identifier: Optional[str] = None) -> "Computer":
+        """
+        Return a new Computer that continues from this one's current state.
 
-    def get_output_buffer(self) -> Deque:
-        return self._output_dest
+        The fork shares memory copy-on-write with this computer and gets
+        its own copies of any copyable ports.
+        """
+        child = copy(self)
+        child._id = self._id if identifier is None else identifier
+        child._handlers = {}
+        child._handler_sizes = {}
+        child._compiled_cells = set()
+        child._hot_addresses = set(self._hot_addresses)
+        child._live_param_addresses = set(self._live_param_addresses)
+        child._profiler = None if self._profiler is None else self._new_profiler()
+        child.restore(self.snapshot())
+        return child
+
+    @staticmethod
+    def _copy_port(port):
+        port_copy = getattr(port, "copy", None)
+        return port if port_copy is None else port_copy()
+
+    def _bind_ports(self, input_port: InputPort, output_port: OutputPort):
+        self._input_port = input_port
+        self._output_port = output_port
+        # Resolved once here rather than dispatched on every I/O instruction
+        self._read_input = input_port.read
+        self._write_output = output_port.write
+        self._clear_handlers()
 
     def add_input(self, input_value: int):
-        self._input_src.append(input_value)
+        """Queue a value on the input port, which must accept writes (e.g. BufferPort)."""
+        self._input_port.write(input_value)
 
     def get_output(self) -> int:
-        return self._output_dest.popleft()
+        """Take the oldest value from the output port, which must allow reads (e.g. BufferPort)."""
+        return self._output_port.read()
 
     def run(self) -> int:
+        if self._profiler is not None:
+            return self._run_profiled()
+        if self._precompile and not self._debug:
+            return self._run_compiled()
         opcode, *pmodes = self._parse_opcode()
         while opcode != Computer.HALT:
             self._process_opcode(opcode, *pmodes)
+            self._steps += 1
             opcode, *pmodes = self._parse_opcode()
         return 0
 
-    def _parse_opcode(self) -> Tuple[int, int, int, int]:
-        pmodes, opcode = divmod(self._get_value(), 100)
+    def _parse_opcode(self, idx: Optional[int] = None) -> Tuple[int, int, int, int]:
+        pmodes, opcode = divmod(self._get_value(idx), 100)
         pmode_1 = pmode_2 = pmode_3 = 0
         if pmodes:
             pmodes, pmode_1 = divmod(pmodes, 10)
@@ -151,10 +375,23 @@ class Computer:
             pmodes, pmode_2 = divmod(pmodes, 10)
         if pmodes:
             pmodes, pmode_3 = divmod(pmodes, 10)
+        if self._feature_limits is not None:
+            self._check_features(opcode, (pmode_1, pmode_2, pmode_3))
         return opcode, pmode_1, pmode_2, pmode_3
 
+    def _check_features(self, opcode: int, pmodes: Tuple[int, int, int]):
+        opcodes, modes = self._feature_limits
+        if opcode != Computer.HALT and opcode not in opcodes:
+            raise UnknownOpCode(opcode)
+        for mode in pmodes:
+            if mode not in modes:
+                raise UnknownMode(mode)
+
     def _process_opcode(self, opcode: int, *pmodes: List[int]):
-        pointer_offset = self.POINTER_OFFSET[opcode]
+        try:
+            pointer_offset = self.POINTER_OFFSET[opcode]
+        except KeyError:
+            raise UnknownOpCode(opcode)
         params = [self._get_value(self._instruction_pointer + i) for i in range(1, pointer_offset)]
 
         values = []
@@ -186,12 +423,12 @@ class Computer:
         elif opcode == Computer.MULTIPLY:
             self._set_value(values[0] * values[1], params[2])
         elif opcode == Computer.INPUT:
-            ipt = self._get_input()
+            ipt = self._read_input()
             self._set_value(ipt, params[0])
             self._input_history.append(ipt)
         elif opcode == Computer.OUTPUT:
             self._output_history.append(values[0])
-            self._add_output(values[0])
+            self._write_output(values[0])
         elif opcode == Computer.JUMP_IF_TRUE:
             if values[0] != 0:
                 self._instruction_pointer = values[1]
@@ -213,40 +450,200 @@ class Computer:
 
         self._instruction_pointer += pointer_offset
 
-    def _get_input(self) -> int:
+    def _run_compiled(self) -> int:
+        """
+        Execute using handlers decoded once per instruction address.
+
+        Handlers are decoded lazily the first time an address is reached
+        and are reused until a write lands on one of their cells.
+        """
+        self._bind_handler_code()
+        handlers = self._handlers
+        compile_handler = self._compile_handler
+        ip = self._instruction_pointer
+        steps = 0
         try:
-            if self._io_src_type == Computer.STDIN_IO_SRC:
-                return int(input("INPUT: "))
-            elif self._io_src_type == Computer.MEMBUF_IO_SRC:
-                return self._input_src.popleft()
-            elif self._io_src_type == Computer.OBJECT_IO_SRC:
-                return self._input_src.get_input()
+            while True:
+                # steps counts the instructions finished before the current one
+                try:
+                    for steps in count(steps):
+                        ip = handlers[ip]()
+                except KeyError:
+                    if ip in handlers:
+                        raise
+                handler = compile_handler(ip)
+                if handler is None:
+                    return 0
+                ip = handler()
+                steps += 1
+        finally:
+            # Leave the pointer on the blocking instruction if input ran out
+            self._instruction_pointer = ip
+            self._steps += steps
+
+    def _run_profiled(self) -> int:
+        """
+        Execute one instruction at a time, recording each in self._profiler.
+
+        Kept apart from the regular loops so profiling costs nothing when off.
+        """
+        profiler = self._profiler
+        compiled = self._precompile and not self._debug
+        if compiled:
+            self._bind_handler_code()
+        while True:
+            address = self._instruction_pointer
+            opcode = self._get_value(address) % 100
+            if opcode == Computer.HALT:
+                profiler.finish()
+                if self._profile_path is not None:
+                    profiler.export(self._profile_path)
+                return 0
+            if compiled:
+                handler = self._handlers.get(address) or self._compile_handler(address)
+                self._instruction_pointer = handler()
             else:
-                raise UnknownIOSource(self._io_src_type)
-        except IndexError:
-            raise EmptyInput()
-
-    def _add_output(self, output_val: int):
-        if self._io_dest_type == Computer.STDOUT_IO_DEST:
-            print(output_val)
-        elif self._io_dest_type == Computer.MEMBUF_IO_DEST:
-            self._output_dest.append(output_val)
-        elif self._io_dest_type == Computer.OBJECT_IO_DEST:
-            self._output_dest.add_output(output_val)
-        else:
-            raise UnknownIODestination(self._io_dest_type)
+                self._process_opcode(*self._parse_opcode())
+            self._steps += 1
+            profiler.record(address, opcode, self._instruction_pointer)
+
+    def _bind_handler_code(self):
+        """
+        Make sure handlers write to a code segment owned by this computer.
+
+        Handlers write the code segment in place, so after a snapshot shares
+        it the segment is copied and every handler decoded against the old
+        one is dropped.
+        """
+        code = self._memory.own_code()
+        if code is not self._handler_code:
+            self._clear_handlers()
+            self._handler_code = code
+
+    def _compile_handler(self, address: int) -> Optional[Callable[[], int]]:
+        """
+        Decode the instruction at address into a handler specialised for its
+        opcode and operand kinds and store it in self._handlers.
+
+        A handler executes its instruction and returns the address of the next
+        instruction. Returns None for HALT, which is never cached. Until an
+        instruction is hot it gets a generic handler instead. Parameters are
+        baked into the handler, except for instructions the program has been
+        seen to rewrite, whose handlers read them on every run.
+        """
+        opcode, *pmodes = self._parse_opcode(address)
+        if opcode == Computer.HALT:
+            return None
+        try:
+            size = self.POINTER_OFFSET[opcode]
+        except KeyError:
+            raise UnknownOpCode(opcode)
+        if address not in self._hot_addresses:
+            return self._compile_generic_handler(address, opcode, pmodes)
+        next_address = address + size
+        code = self._handler_code
+        code_size = self._memory.code_size
+        live_params = address in self._live_param_addresses and next_address <= code_size
+
+        params = [address + i if live_params else self._get_value(address + i) for i in range(1, size)]
+        destination = {
+            Computer.ADD: 2, Computer.MULTIPLY: 2, Computer.LESS_THAN: 2, Computer.EQUALS: 2, Computer.INPUT: 0
+        }.get(opcode)
+        kinds = []
+        for i, param in enumerate(params):
+            mode = pmodes[i]
+            if mode == Computer.RELATIVE_MODE:
+                kinds.append(RELATIVE_OPERAND)
+            elif mode == Computer.IMMEDIATE_MODE and i != destination:
+                kinds.append(IMMEDIATE_OPERAND)
+            elif mode not in (Computer.POSITION_MODE, Computer.IMMEDIATE_MODE):
+                raise UnknownMode(mode)
+            elif live_params:
+                kinds.append(DYNAMIC_OPERAND)
+            else:
+                kinds.append(CODE_OPERAND if param < code_size else PAGE_OPERAND)
+        kinds = tuple(kinds)
+
+        key = (opcode, kinds, live_params)
+        bind = Computer._HANDLER_BINDERS.get(key)
+        if bind is None:
+            namespace = {}
+            exec(_handler_source(*key), namespace)
+            bind = Computer._HANDLER_BINDERS[key] = namespace["bind"]
+        params += [None] * (3 - len(params))
+        handler = bind(
+            self, code, code_size, self._memory.read, self._memory.write,
+            self._compiled_cells, self._invalidate_handlers,
+            self._read_input, self._write_output, self._input_history, self._output_history,
+            *params, next_address,
+        )
+
+        # Rewriting a live parameter needs no new handler, only a new opcode does
+        covered = 1 if live_params else size
+        self._handlers[address] = handler
+        self._handler_sizes[address] = covered
+        self._compiled_cells.update(range(address, address + covered))
+        return handler
+
+    def _compile_generic_handler(self, address: int, opcode: int, pmodes: List[int]) -> Callable[[], int]:
+        """
+        Return a handler that runs the instruction through the interpreter,
+        so code that runs only a few times never pays for specialising.
+        After HOT_THRESHOLD runs it drops itself for a specialised handler.
+        """
+        process_opcode = self._process_opcode
+        runs = 0
+
+        def handler():
+            nonlocal runs
+            runs += 1
+            if runs == Computer.HOT_THRESHOLD:
+                self._hot_addresses.add(address)
+                del self._handlers[address]
+                del self._handler_sizes[address]
+            self._instruction_pointer = address
+            process_opcode(opcode, *pmodes)
+            return self._instruction_pointer
+
+        # Parameters are read on every run, so only a new opcode needs a new handler
+        self._handlers[address] = handler
+        self._handler_sizes[address] = 1
+        self._compiled_cells.add(address)
+        return handler
+
+    def _clear_handlers(self):
+        self._handlers.clear()
+        self._handler_sizes.clear()
+        self._compiled_cells.clear()
+
+    def _invalidate_handlers(self, idx: int):
+        """Drop every decoded handler whose instruction covers idx."""
+        for address in range(idx - Computer.MAX_POINTER_OFFSET + 1, idx + 1):
+            size = self._handler_sizes.get(address)
+            if size is not None and address + size > idx:
+                del self._handlers[address]
+                del self._handler_sizes[address]
+                if address != idx:
+                    self._live_param_addresses.add(address)
+        if not self._is_compiled(idx):
+            self._compiled_cells.discard(idx)
+
+    def _is_compiled(self, idx: int) -> bool:
+        """Return True if any decoded handler covers idx."""
+        for address in range(idx - Computer.MAX_POINTER_OFFSET + 1, idx + 1):
+            size = self._handler_sizes.get(address)
+            if size is not None and address + size > idx:
+                return True
+        return False
 
     def _get_value(self, idx: Optional[int] = None) -> int:
         idx = self._instruction_pointer if idx is None else idx
-        self._pad_memory(idx)
-        return self._memory[idx]
+        return self._memory.read(idx)
 
     def _set_value(self, value: int, idx: int):
-        self._pad_memory(idx)
-        self._memory[idx] = value
-
-    def _pad_memory(self, idx: int):
-        self._memory.extend([0 for _ in range(idx + 1 - len(self._memory))])
+        self._memory.write(idx, value)
+        if idx in self._compiled_cells:
+            self._invalidate_handlers(idx)
 
-    def dump(self):
-        return self._memory
+    def dump(self) -> List[int]:
+        return self._memory.dump()
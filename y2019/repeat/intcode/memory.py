@@ -0,0 +1,91 @@
+"""Sparse paged memory backing a Computer."""
+from copy import copy
+from typing import List
+
+
+class PagedMemory:
+    """
+    Intcode memory split into a dense code segment and sparse fixed-size pages.
+
+    Addresses inside the original program are served from a plain list.
+    Everything beyond it lives in pages that are only allocated on first
+    write, so touching a huge address costs one page rather than padding
+    every address in between.
+
+    Clones are copy-on-write: the code segment and each page stay shared
+    until one side writes to them.
+    """
+    PAGE_SHIFT = 10
+    PAGE_SIZE = 1 << PAGE_SHIFT
+    PAGE_MASK = PAGE_SIZE - 1
+
+    def __init__(self, code: List[int]):
+        self._code = [val for val in code]
+        self._code_size = len(self._code)
+        self._pages = {}  # type: Dict[int, List[int]]
+        # Parts of memory that this instance may write in place
+        self._code_owned = True
+        self._owned_pages = set()
+        # One past the highest address touched, mirrors a padded list's length
+        self._size = self._code_size
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def resident_pages(self) -> int:
+        return len(self._pages)
+
+    @property
+    def code_size(self) -> int:
+        return self._code_size
+
+    def own_code(self) -> List[int]:
+        """Return the code segment for writing in place, copying it first if it is shared."""
+        if not self._code_owned:
+            self._code = [val for val in self._code]
+            self._code_owned = True
+        return self._code
+
+    def clone(self) -> "PagedMemory":
+        """Return a copy sharing the code segment and all pages with self."""
+        other = copy(self)
+        other._pages = dict(self._pages)
+        other._owned_pages = set()
+        self._owned_pages = set()
+        self._code_owned = other._code_owned = False
+        return other
+
+    def read(self, idx: int) -> int:
+        if idx < self._code_size:
+            return self._code[idx]
+        if idx >= self._size:
+            self._size = idx + 1
+        page = self._pages.get(idx >> PagedMemory.PAGE_SHIFT)
+        return 0 if page is None else page[idx & PagedMemory.PAGE_MASK]
+
+    def write(self, idx: int, value: int):
+        if idx < self._code_size:
+            self.own_code()[idx] = value
+            return
+        if idx >= self._size:
+            self._size = idx + 1
+        page_num = idx >> PagedMemory.PAGE_SHIFT
+        page = self._pages.get(page_num)
+        if page is None:
+            page = self._pages[page_num] = [0] * PagedMemory.PAGE_SIZE
+            self._owned_pages.add(page_num)
+        elif page_num not in self._owned_pages:
+            page = self._pages[page_num] = page[:]
+            self._owned_pages.add(page_num)
+        page[idx & PagedMemory.PAGE_MASK] = value
+
+    def dump(self) -> List[int]:
+        """Return memory as a flat list up to the highest address touched."""
+        values = self._code + [0] * (self._size - self._code_size)
+        for page_num, page in self._pages.items():
+            page_start = page_num << PagedMemory.PAGE_SHIFT
+            start = max(page_start, self._code_size)
+            end = min(page_start + PagedMemory.PAGE_SIZE, self._size)
+            values[start:end] = page[start - page_start:end - page_start]
+        return values
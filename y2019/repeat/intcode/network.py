@@ -0,0 +1,222 @@
+"""Many Computers connected through channels on one asyncio event loop."""
+import asyncio
+from collections import defaultdict
+from typing import List, Dict, Tuple, Optional, Callable, Iterable
+
+from .intcode5 import Computer
+from .ports import BufferPort, EmptyInput
+
+
+class NetworkDeadlock(Exception):
+    def __init__(self, waiting: Iterable[str]):
+        super().__init__(sorted(waiting))
+
+
+# Picks the destination and values to send for a packet of outputs
+Router = Callable[[List[int]], Optional[Tuple[str, List[int]]]]
+
+
+class Channel:
+    """Bounded queue of values flowing into one Computer of a Network."""
+
+    def __init__(self, max_size: int):
+        self._queue = asyncio.Queue(max_size)
+        self.closed = False
+
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+    def full(self) -> bool:
+        return not self.closed and self._queue.full()
+
+    async def put(self, value: int):
+        # Values sent to a halted machine are dropped
+        if not self.closed:
+            await self._queue.put(value)
+
+    async def get(self) -> int:
+        return await self._queue.get()
+
+    def close(self):
+        """Stop accepting values and release any producers blocked on a full queue."""
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+class Network:
+    """
+    Run many connected Computers cooperatively on one asyncio event loop.
+
+    Each machine is a coroutine that runs until it needs input, sends its
+    outputs on and suspends until a value arrives in its own channel.
+    Outputs either go to every machine the source is connected to, or are
+    grouped into packets and sent wherever a router picks. A machine added
+    with an idle input reads that value instead of suspending when its
+    channel is empty, for programs that poll for packets.
+    """
+
+    def __init__(self, channel_size: int = 64, precompile: bool = True):
+        self._channel_size = channel_size
+        self._precompile = precompile
+        self._machines = {}  # type: Dict[str, Computer]
+        self._routes = defaultdict(list)  # type: Dict[str, List[str]]
+        self._routers = {}  # type: Dict[str, Tuple[int, Router]]
+        # Outputs of a routed machine that do not yet fill a packet
+        self._partial_packets = defaultdict(list)  # type: Dict[str, List[int]]
+        self._idle_inputs = {}  # type: Dict[str, int]
+        self._channels = {}  # type: Dict[str, Channel]
+        self._live = set()
+        self._waiting = set()
+        # Machines blocked sending to a full channel, by that channel
+        self._blocked = {}  # type: Dict[str, Channel]
+        self._stalled = None  # type: Optional[asyncio.Event]
+
+    @property
+    def steps(self) -> Dict[str, int]:
+        """Instructions executed by each machine."""
+        return {identifier: computer.steps for identifier, computer in self._machines.items()}
+
+    def add_machine(
+            self,
+            code: List[int],
+            identifier: str,
+            initial_inputs: Iterable[int] = (),
+            idle_input: Optional[int] = None,
+    ) -> Computer:
+        if idle_input is not None:
+            self._idle_inputs[identifier] = idle_input
+        computer = Computer(
+            code,
+            identifier=identifier,
+            input_port=BufferPort(initial_inputs),
+            output_port=BufferPort(),
+            precompile=self._precompile,
+        )
+        self._machines[identifier] = computer
+        return computer
+
+    def get_machine(self, identifier: str) -> Computer:
+        return self._machines[identifier]
+
+    def connect(self, source: str, destination: str):
+        """Send every output of source to the input of destination."""
+        self._routes[source].append(destination)
+
+    def route(self, source: str, router: Router, packet_size: int):
+        """
+        Group the outputs of source into packets of packet_size values and
+        send each to the machine router(packet) names, as the values it
+        returns. A router returning None drops the packet.
+        """
+        self._routers[source] = (packet_size, router)
+
+    def run(self) -> Dict[str, int]:
+        """Run every machine until all have halted. Returns self.steps."""
+        asyncio.run(self.run_async())
+        return self.steps
+
+    async def run_async(self):
+        self._channels = {identifier: Channel(self._channel_size) for identifier in self._machines}
+        self._live = set(self._machines)
+        self._waiting = set()
+        self._blocked = {}
+        self._stalled = asyncio.Event()
+        stalled = asyncio.create_task(self._stalled.wait())
+        pending = {asyncio.create_task(self._run_machine(identifier)) for identifier in self._machines}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending | {stalled}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(stalled)
+                for task in done - {stalled}:
+                    task.result()  # Surface machine errors
+                if stalled.done():
+                    raise NetworkDeadlock(self._waiting | set(self._blocked))
+        finally:
+            for task in pending | {stalled}:
+                task.cancel()
+
+    async def _run_machine(self, identifier: str):
+        computer = self._machines[identifier]
+        channel = self._channels[identifier]
+        idle_input = self._idle_inputs.get(identifier)
+        read_idle = False
+        try:
+            while True:
+                try:
+                    computer.run()
+                    halted = True
+                except EmptyInput:
+                    halted = False
+                sent = await self._send_outputs(identifier)
+                if halted:
+                    break
+                if idle_input is not None:
+                    # Polling again without having sent anything counts as waiting
+                    if read_idle and not sent:
+                        self._waiting.add(identifier)
+                        self._check_stalled()
+                    else:
+                        self._waiting.discard(identifier)
+                    # Give peers a turn before falling back to the idle input
+                    await asyncio.sleep(0)
+                    if channel.empty():
+                        computer.add_input(idle_input)
+                        read_idle = True
+                        continue
+                read_idle = False
+                self._waiting.add(identifier)
+                self._check_stalled()
+                value = await channel.get()
+                self._waiting.discard(identifier)
+                computer.add_input(value)
+        finally:
+            self._live.discard(identifier)
+            channel.close()
+            self._check_stalled()
+
+    async def _send_outputs(self, identifier: str) -> bool:
+        """Send every pending output of identifier on. Returns True if there were any."""
+        destinations = self._routes.get(identifier)
+        if identifier not in self._routers and not destinations:
+            # Outputs of unconnected machines stay on their port to be read
+            return False
+        outputs = self._machines[identifier].output_port.drain()
+        if identifier in self._routers:
+            packet_size, router = self._routers[identifier]
+            packets = self._partial_packets[identifier]
+            packets.extend(outputs)
+            complete = len(packets) - len(packets) % packet_size
+            for start in range(0, complete, packet_size):
+                routed = router(packets[start:start + packet_size])
+                if routed is not None:
+                    destination, values = routed
+                    for value in values:
+                        await self._put(identifier, self._channels[destination], value)
+            del packets[:complete]
+        else:
+            for value in outputs:
+                for destination in destinations:
+                    await self._put(identifier, self._channels[destination], value)
+        return bool(outputs)
+
+    async def _put(self, identifier: str, channel: Channel, value: int):
+        """Send value from identifier into channel, noting if it has to wait for room."""
+        if channel.full():
+            self._blocked[identifier] = channel
+            self._check_stalled()
+        await channel.put(value)
+        self._blocked.pop(identifier, None)
+
+    def _check_stalled(self):
+        """
+        Flag a deadlock once every live machine either waits on an empty
+        channel or is blocked sending to a full one.
+        """
+        if (
+                self._live
+                and self._waiting | set(self._blocked) == self._live
+                and all(self._channels[identifier].empty() for identifier in self._waiting)
+                and all(channel.full() for channel in self._blocked.values())
+        ):
+            self._stalled.set()
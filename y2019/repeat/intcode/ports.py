@@ -0,0 +1,125 @@
+"""Input and output ports a Computer reads from and writes to."""
+from array import array
+from collections import deque
+from copy import copy
+from typing import List, Tuple, Iterable, Protocol
+
+
+class EmptyInput(Exception):
+    pass
+
+
+class InputPort(Protocol):
+    def read(self) -> int:
+        ...
+
+
+class OutputPort(Protocol):
+    def write(self, value: int):
+        ...
+
+
+class StdinPort:
+    def read(self) -> int:
+        return int(input("INPUT: "))
+
+
+class StdoutPort:
+    def write(self, value: int):
+        print(value)
+
+
+class BufferPort:
+    """
+    In-memory FIFO that works as an input port, an output port or both,
+    so one machine's output port can be handed to another as its input.
+    """
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._buffer = deque(values)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+    def read(self) -> int:
+        try:
+            return self._buffer.popleft()
+        except IndexError:
+            raise EmptyInput()
+
+    def write(self, value: int):
+        self._buffer.append(value)
+
+    def extend(self, values: Iterable[int]):
+        self._buffer.extend(values)
+
+    def drain(self) -> List[int]:
+        """Remove and return every buffered value."""
+        values = list(self._buffer)
+        self._buffer.clear()
+        return values
+
+    def copy(self) -> "BufferPort":
+        return BufferPort(self._buffer)
+
+
+class RingOutputPort:
+    """
+    Output port storing values in a growable array('q') ring.
+
+    Pending values can be inspected through memoryviews of the ring with
+    no copying, then released in bulk with consume(). Values must fit in
+    a signed 64-bit integer.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._ring = array("q", bytes(max(capacity, 1) * array("q").itemsize))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def write(self, value: int):
+        if self._count == len(self._ring):
+            self._grow()
+        self._ring[(self._start + self._count) % len(self._ring)] = value
+        self._count += 1
+
+    def views(self) -> Tuple[memoryview, memoryview]:
+        """Return pending values, oldest first, as two views into the ring."""
+        view = memoryview(self._ring)
+        end = self._start + self._count
+        if end <= len(self._ring):
+            return view[self._start:end], view[:0]
+        return view[self._start:], view[:end - len(self._ring)]
+
+    def consume(self, count: int):
+        """Release the oldest count values."""
+        count = min(count, self._count)
+        self._count -= count
+        self._start = (self._start + count) % len(self._ring) if self._count else 0
+
+    def drain(self) -> List[int]:
+        """Remove and return every pending value."""
+        first, second = self.views()
+        values = first.tolist() + second.tolist()
+        self.consume(self._count)
+        return values
+
+    def copy(self) -> "RingOutputPort":
+        other = copy(self)
+        other._ring = array("q", self._ring)
+        return other
+
+    def _grow(self):
+        # A new array is built so any views handed out stay valid
+        first, second = self.views()
+        ring = array("q", first)
+        ring.extend(second)
+        ring.extend(array("q", bytes(len(ring) * ring.itemsize)))
+        self._ring = ring
+        self._start = 0
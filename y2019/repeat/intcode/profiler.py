@@ -0,0 +1,91 @@
+"""Execution profile of a Computer run with profile=True."""
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict
+
+
+class Profiler:
+    """
+    Execution counts for a Computer created with profile=True.
+
+    Tracks executions per opcode and per instruction address, how often
+    each jump target is reached, and basic blocks, which run from an entry
+    point or jump target up to and including the next jump instruction.
+    Opcodes are reported by their names in opcode_names, and jump_sizes
+    holds the size of each jump instruction to tell taken jumps apart.
+    """
+    def __init__(self, opcode_names: Dict[int, str], jump_sizes: Dict[int, int]):
+        self._opcode_names = opcode_names
+        self._jump_sizes = jump_sizes
+        self.opcode_counts = Counter()
+        self.address_counts = Counter()
+        self.jump_targets = Counter()
+        # Keyed by the block's first address
+        self.block_counts = Counter()
+        self.block_steps = Counter()
+        self.block_ends = {}  # type: Dict[int, int]
+        self._block_start = None  # type: Optional[int]
+        self._block_length = 0
+        self._last_address = None  # type: Optional[int]
+
+    def record(self, address: int, opcode: int, next_address: int):
+        if self._block_start is None:
+            self._block_start = address
+        self._block_length += 1
+        self._last_address = address
+        self.opcode_counts[opcode] += 1
+        self.address_counts[address] += 1
+        jump_size = self._jump_sizes.get(opcode)
+        if jump_size is not None:
+            if next_address != address + jump_size:
+                self.jump_targets[next_address] += 1
+            self._close_block(address)
+
+    def finish(self):
+        """Close the block that was running when the program halted."""
+        if self._block_start is not None:
+            self._close_block(self._last_address)
+
+    def _close_block(self, end_address: int):
+        self.block_counts[self._block_start] += 1
+        self.block_steps[self._block_start] += self._block_length
+        self.block_ends[self._block_start] = end_address
+        self._block_start = None
+        self._block_length = 0
+
+    def report(self, top_n: int = 10) -> Dict:
+        return {
+            "steps": sum(self.opcode_counts.values()),
+            "opcodes": {
+                self._opcode_names.get(opcode, str(opcode)): count
+                for opcode, count in self.opcode_counts.most_common()
+            },
+            "addresses": [[address, count] for address, count in self.address_counts.most_common(top_n)],
+            "jump_targets": [[address, count] for address, count in self.jump_targets.most_common(top_n)],
+            "blocks": [
+                {"start": start, "end": self.block_ends[start], "entries": self.block_counts[start], "steps": steps}
+                for start, steps in self.block_steps.most_common(top_n)
+            ],
+        }
+
+    def summary(self, top_n: int = 10) -> str:
+        report = self.report(top_n)
+        lines = [f"STEPS: {report['steps']}", "", "OPCODES:"]
+        lines.extend(f"  {name:<16}{count:>12}" for name, count in report["opcodes"].items())
+        lines.extend(["", f"TOP {top_n} ADDRESSES:"])
+        lines.extend(f"  {address:>8}{count:>12}" for address, count in report["addresses"])
+        lines.extend(["", f"TOP {top_n} JUMP TARGETS:"])
+        lines.extend(f"  {address:>8}{count:>12}" for address, count in report["jump_targets"])
+        lines.extend(["", f"TOP {top_n} BLOCKS:"])
+        lines.extend(
+            f"  {block['start']:>8}-{block['end']:<8}{block['entries']:>12} entries{block['steps']:>12} steps"
+            for block in report["blocks"]
+        )
+        return "\n".join(lines)
+
+    def export(self, path: str, top_n: int = 10):
+        """Write the report as JSON to path and as text next to it with a .txt suffix."""
+        path = Path(path)
+        path.write_text(json.dumps(self.report(top_n), indent=2))
+        path.with_suffix(".txt").write_text(self.summary(top_n) + "\n")
@@ -0,0 +1,113 @@
+"""Run many patched or differently fed copies of one program across processes."""
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+from typing import List, Dict, Optional, Callable, Sequence
+
+from .intcode5 import Computer, UnknownMode, UnknownOpCode
+from .ports import BufferPort, EmptyInput
+
+
+class SweepCase:
+    """One candidate run for sweep: memory to patch and inputs to feed."""
+
+    def __init__(self, patch: Optional[Dict[int, int]] = None, inputs: Optional[List[int]] = None):
+        self.patch = {} if patch is None else patch
+        self.inputs = [] if inputs is None else inputs
+
+    def run(self, code: List[int], precompile: bool = True) -> Computer:
+        computer = Computer(
+            code,
+            input_port=BufferPort(self.inputs),
+            output_port=BufferPort(),
+            precompile=precompile,
+        )
+        computer.initialize(self.patch)
+        computer.run()
+        return computer
+
+
+# Program attached from shared memory, set once per sweep worker process
+_SWEEP_CODE = []  # type: List[int]
+
+
+def _init_sweep_worker(shm_name: str, code_size: int):
+    global _SWEEP_CODE
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        packed = array("q")
+        packed.frombytes(shm.buf[:code_size * packed.itemsize])
+        _SWEEP_CODE = packed.tolist()
+    finally:
+        shm.close()
+
+
+def _sweep_chunk(
+        start: int,
+        cases: List[SweepCase],
+        predicate: Callable[[Computer], bool],
+        precompile: bool,
+) -> Optional[int]:
+    for offset, case in enumerate(cases):
+        try:
+            computer = case.run(_SWEEP_CODE, precompile)
+        except (UnknownOpCode, UnknownMode, EmptyInput):
+            # Patches can turn the program into garbage, and an input
+            # sequence can run out early; either is just a miss
+            continue
+        if predicate(computer):
+            return start + offset
+    return None
+
+
+def sweep(
+        code: List[int],
+        cases: Sequence[SweepCase],
+        predicate: Callable[[Computer], bool],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 32,
+        precompile: bool = True,
+) -> Optional[int]:
+    """
+    Run every case against code across a process pool and return the index
+    of the first case whose finished Computer satisfies predicate.
+
+    The program is copied into shared memory once and attached by each
+    worker when it starts, so cases only carry their own patch and inputs.
+    Chunks after a match are cancelled, but earlier chunks still finish so
+    the lowest matching index wins. Cases that crash on a bad opcode or
+    mode, or that run out of inputs, count as misses. predicate must be
+    picklable, e.g. a module-level function or a functools.partial of one.
+    Very short programs may run faster with precompile=False.
+    """
+    packed = array("q", code)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(packed) * packed.itemsize, 1))
+    try:
+        shm.buf[:len(packed) * packed.itemsize] = packed.tobytes()
+        with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_sweep_worker,
+                initargs=(shm.name, len(packed)),
+        ) as executor:
+            pending = {
+                executor.submit(_sweep_chunk, start, list(cases[start:start + chunk_size]), predicate, precompile): start
+                for start in range(0, len(cases), chunk_size)
+            }
+            best = None
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    match = future.result()
+                    if match is not None and (best is None or match < best):
+                        best = match
+                if best is not None:
+                    # Only chunks before the best match can still beat it
+                    for future, start in pending.items():
+                        if start > best:
+                            future.cancel()
+                    pending = {future: start for future, start in pending.items() if start < best}
+            return best
+    finally:
+        shm.close()
+        shm.unlink()
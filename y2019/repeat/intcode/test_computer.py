@@ -2,7 +2,7 @@ from collections import deque
 
 import pytest
 
-from intcode4 import Computer
+from intcode.intcode4 import Computer
 
 
 def test_init_copies_data():
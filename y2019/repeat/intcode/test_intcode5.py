@@ -0,0 +1,483 @@
+import functools
+import json
+
+import pytest
+
+from intcode import (
+    BufferPort,
+    Computer,
+    EmptyInput,
+    Network,
+    NetworkDeadlock,
+    PagedMemory,
+    RingOutputPort,
+    SweepCase,
+    UnknownMode,
+    UnknownOpCode,
+    sweep,
+)
+from intcode.benchmark import measure
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_quine(precompile):
+    # GIVEN
+    data = [109, 1, 204, -1, 1001, 100, 1, 100, 1008, 100, 16, 101, 1006, 101, 0, 99]
+    computer = Computer(data, output_port=BufferPort(), precompile=precompile)
+
+    # WHEN
+    result = computer.run()
+
+    # THEN
+    assert list(computer.output_port) == data
+    assert result == 0
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_self_modifying_code(precompile):
+    # GIVEN: a loop that rewrites the opcode of its own output instruction
+    data = [
+        4, 20,          # 0: output memory[20], rewritten to 104 (immediate) on second pass
+        1001, 0, 100, 0,  # 2: memory[0] += 100
+        1008, 0, 104, 21,  # 6: memory[21] = memory[0] == 104
+        1005, 21, 0,    # 10: loop back once the opcode has been patched
+        99,             # 13
+        0, 0, 0, 0, 0, 0,
+        7, 0,           # 20, 21
+    ]
+    computer = Computer(data, output_port=BufferPort(), precompile=precompile)
+
+    # WHEN
+    result = computer.run()
+
+    # THEN: second pass of the patched instruction outputs its parameter directly
+    assert list(computer.output_port) == [7, 20]
+    assert result == 0
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_rewritten_parameter_in_hot_loop(precompile):
+    # GIVEN: a loop that walks a table by adding one to its output's parameter
+    data = [3, 20, 4, 50, 1001, 3, 1, 3, 1001, 20, -1, 20, 1005, 20, 2, 99] + [0] * 34 + list(range(100, 120))
+    computer = Computer(data, input_port=BufferPort(), output_port=BufferPort(), precompile=precompile)
+    start = computer.snapshot()
+
+    # WHEN: run to the end, then again from the start over fewer entries
+    computer.add_input(20)
+    computer.run()
+    first_run = list(computer.output_port)
+    computer.restore(start)
+    computer.add_input(5)
+    computer.run()
+
+    # THEN
+    assert first_run == list(range(100, 120))
+    assert list(computer.output_port) == list(range(100, 105))
+    assert computer.dump()[3] == 55
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_resume_after_empty_input(precompile):
+    # GIVEN: a program that echoes two inputs
+    data = [3, 9, 4, 9, 3, 9, 4, 9, 99, 0]
+    computer = Computer(
+        data,
+        input_port=BufferPort(),
+        output_port=BufferPort(),
+        precompile=precompile,
+    )
+    computer.add_input(5)
+
+    # WHEN: input runs out part way through
+    with pytest.raises(EmptyInput):
+        computer.run()
+    computer.add_input(6)
+    result = computer.run()
+
+    # THEN
+    assert list(computer.output_port) == [5, 6]
+    assert computer.input_history == [5, 6]
+    assert result == 0
+
+
+def test_precompiled_matches_interpreted():
+    # GIVEN: the day 5 comparison program, which outputs 999/1000/1001 for input below/equal/above 8
+    data = [
+        3, 21, 1008, 21, 8, 20, 1005, 20, 22, 107, 8, 21, 20, 1006, 20, 31,
+        1106, 0, 36, 98, 0, 0, 1002, 21, 125, 20, 4, 20, 1105, 1, 46, 104,
+        999, 1105, 1, 46, 1101, 1000, 1, 20, 4, 20, 1105, 1, 46, 98, 99,
+    ]
+    for value in range(6, 11):
+        outputs = []
+        for precompile in (False, True):
+            computer = Computer(
+                data,
+                input_port=BufferPort([value]),
+                output_port=BufferPort(),
+                precompile=precompile,
+            )
+
+            # WHEN
+            computer.run()
+            outputs.append((list(computer.output_port), computer.dump()))
+
+        # THEN
+        assert outputs[0] == outputs[1]
+
+
+def test_paged_memory_dump_matches_padded_list():
+    # GIVEN
+    memory = PagedMemory([1, 2, 3])
+
+    # WHEN: a write lands past the code segment and a read lands past that
+    memory.write(PagedMemory.PAGE_SIZE + 2, 7)
+    memory.read(PagedMemory.PAGE_SIZE + 4)
+
+    # THEN: dump looks like a list padded up to the highest address touched
+    expected = [1, 2, 3] + [0] * (PagedMemory.PAGE_SIZE - 1) + [7, 0, 0]
+    assert memory.dump() == expected
+    assert len(memory) == len(expected)
+    assert memory.resident_pages == 1
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_high_address_allocates_single_page(precompile):
+    # GIVEN: a program that writes to and reads back from a huge relative address
+    data = [109, 10 ** 12, 21101, 5, 6, 0, 204, 0, 99]
+    computer = Computer(data, output_port=BufferPort(), precompile=precompile)
+
+    # WHEN
+    result = computer.run()
+
+    # THEN
+    assert list(computer.output_port) == [11]
+    assert computer.resident_pages == 1
+    assert result == 0
+
+
+def test_paged_memory_clone_is_copy_on_write():
+    # GIVEN
+    memory = PagedMemory([1, 2, 3])
+    memory.write(PagedMemory.PAGE_SIZE, 4)
+
+    # WHEN
+    clone = memory.clone()
+    clone.write(0, 10)
+    clone.write(PagedMemory.PAGE_SIZE, 40)
+
+    # THEN
+    assert memory.read(0) == 1
+    assert memory.read(PagedMemory.PAGE_SIZE) == 4
+    assert clone.read(0) == 10
+    assert clone.read(PagedMemory.PAGE_SIZE) == 40
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_fork_runs_independently(precompile):
+    # GIVEN: a program that outputs the sum of two inputs, paused before the second
+    data = [3, 11, 3, 12, 1, 11, 12, 13, 4, 13, 99, 0, 0, 0]
+    computer = Computer(
+        data,
+        input_port=BufferPort(),
+        output_port=BufferPort(),
+        precompile=precompile,
+    )
+    computer.add_input(10)
+    with pytest.raises(EmptyInput):
+        computer.run()
+
+    # WHEN: each branch receives a different second input
+    branches = [computer.fork(identifier=str(i)) for i in range(3)]
+    for i, branch in enumerate(branches):
+        branch.add_input(i)
+        branch.run()
+
+    # THEN
+    assert [branch.get_output() for branch in branches] == [10, 11, 12]
+    assert [branch.id for branch in branches] == ["0", "1", "2"]
+    assert computer.dump()[11:] == [10, 0, 0]
+    assert len(computer.output_port) == 0
+
+
+def test_restore_snapshot_repeatedly():
+    # GIVEN
+    data = [3, 9, 1002, 9, 3, 9, 4, 9, 99, 0]
+    computer = Computer(data, input_port=BufferPort(), output_port=BufferPort())
+    snapshot = computer.snapshot()
+
+    for value in (2, 5):
+        # WHEN
+        computer.restore(snapshot)
+        computer.add_input(value)
+        computer.run()
+
+        # THEN
+        assert list(computer.output_port) == [value * 3]
+        assert computer.input_history == [value]
+
+
+def test_network_feedback_loop():
+    # GIVEN: the day 7 feedback loop example
+    data = [
+        3, 26, 1001, 26, -4, 26, 3, 27, 1002, 27, 2, 27, 1, 27, 26,
+        27, 4, 27, 1001, 28, -1, 28, 1005, 28, 6, 99, 0, 0, 5,
+    ]
+    network = Network(channel_size=1)
+    identifiers = "ABCDE"
+    for identifier, phase_setting in zip(identifiers, [9, 8, 7, 6, 5]):
+        network.add_machine(data, identifier, initial_inputs=[phase_setting])
+    network.get_machine("A").add_input(0)
+    for source, destination in zip(identifiers, identifiers[1:] + identifiers[0]):
+        network.connect(source, destination)
+
+    # WHEN
+    steps = network.run()
+
+    # THEN
+    assert network.get_machine("E").output_history[-1] == 139629729
+    assert set(steps) == set(identifiers)
+    assert all(count > 0 for count in steps.values())
+
+
+def test_network_large_ring():
+    # GIVEN: a ring of machines that each add one to the value passing through
+    data = [3, 9, 1001, 9, 1, 9, 4, 9, 99, 0]
+    machine_count = 300
+    network = Network(channel_size=1)
+    for i in range(machine_count):
+        network.add_machine(data, str(i))
+        network.connect(str(i), str((i + 1) % machine_count))
+    network.get_machine("0").add_input(0)
+
+    # WHEN
+    steps = network.run()
+
+    # THEN: the last machine's output went back to the halted first machine
+    assert network.get_machine(str(machine_count - 1)).output_history == [machine_count]
+    assert set(steps.values()) == {3}
+
+
+def test_network_deadlock():
+    # GIVEN: two machines that each wait for the other
+    data = [3, 7, 4, 7, 99, 0, 0, 0]
+    network = Network()
+    network.add_machine(data, "A")
+    network.add_machine(data, "B")
+    network.connect("A", "B")
+    network.connect("B", "A")
+
+    # THEN
+    with pytest.raises(NetworkDeadlock):
+        network.run()
+
+
+def test_network_deadlock_on_full_channels():
+    # GIVEN: two machines that each send the other more values than a channel holds
+    data = [4, 17, 1001, 17, 1, 17, 1007, 17, 100, 18, 1005, 18, 0, 99, 0, 0, 0, 0, 0]
+    network = Network(channel_size=4)
+    network.add_machine(data, "A")
+    network.add_machine(data, "B")
+    network.connect("A", "B")
+    network.connect("B", "A")
+
+    # THEN
+    with pytest.raises(NetworkDeadlock):
+        network.run()
+
+
+# Polls with input until it gets something other than -1, then outputs it
+POLLING_ECHO = [3, 20, 1008, 20, -1, 21, 1005, 21, 0, 4, 20, 99] + [0] * 10
+
+
+def test_network_routes_packets_to_idle_machines():
+    # GIVEN: a sender of (address, value) packets and two polling receivers
+    network = Network()
+    network.add_machine([104, 2, 104, 20, 104, 1, 104, 10, 99], "sender")
+    network.add_machine(POLLING_ECHO, "1", idle_input=-1)
+    network.add_machine(POLLING_ECHO, "2", idle_input=-1)
+    network.route("sender", lambda packet: (str(packet[0]), packet[1:]), packet_size=2)
+
+    # WHEN
+    network.run()
+
+    # THEN
+    assert network.get_machine("1").output_history == [10]
+    assert network.get_machine("2").output_history == [20]
+    assert network.get_machine("1").input_history[-1] == 10
+
+
+def test_network_idle_machines_deadlock():
+    # GIVEN: polling machines that nothing ever sends to
+    network = Network()
+    network.add_machine(POLLING_ECHO, "A", idle_input=-1)
+    network.add_machine(POLLING_ECHO, "B", idle_input=-1)
+
+    # THEN
+    with pytest.raises(NetworkDeadlock):
+        network.run()
+
+
+def first_value_is(goal, computer):
+    return computer.dump()[0] == goal
+
+
+def value_at_is(address, goal, computer):
+    return computer.dump()[address] == goal
+
+
+def last_output_is(goal, computer):
+    return computer.output_history[-1] == goal
+
+
+def test_sweep_patches_returns_lowest_match():
+    # GIVEN: memory[0] = noun + verb, with several patches giving 5
+    data = [1101, 0, 0, 0, 99]
+    cases = [SweepCase(patch={1: noun, 2: verb}) for noun in range(5) for verb in range(5)]
+
+    # WHEN
+    match = sweep(data, cases, functools.partial(first_value_is, 5), max_workers=2, chunk_size=3)
+
+    # THEN
+    assert cases[match].patch == {1: 1, 2: 4}
+
+
+@pytest.mark.parametrize("precompile", [True, False])
+def test_sweep_bad_opcode_is_a_miss(precompile):
+    # GIVEN: a patch that turns the first instruction into an unknown opcode
+    data = [1, 0, 0, 0, 99]
+    cases = [SweepCase(patch={0: 55}), SweepCase(patch={0: 1}), SweepCase(patch={0: 2})]
+
+    # WHEN
+    match = sweep(data, cases, functools.partial(first_value_is, 4), max_workers=1, precompile=precompile)
+
+    # THEN
+    assert match == 2
+
+
+def test_sweep_short_inputs_are_a_miss():
+    # GIVEN: a program that adds two inputs, and a case with only one
+    data = [3, 9, 3, 10, 1, 9, 10, 11, 99, 0, 0, 0]
+    cases = [SweepCase(inputs=[1]), SweepCase(inputs=[2, 3])]
+
+    # WHEN
+    match = sweep(data, cases, functools.partial(value_at_is, 11, 5), max_workers=1)
+
+    # THEN
+    assert match == 1
+
+
+def test_sweep_inputs_no_match():
+    # GIVEN: a program that echoes its input
+    data = [3, 5, 4, 5, 99, 0]
+    cases = [SweepCase(inputs=[value]) for value in range(10)]
+
+    # WHEN
+    match = sweep(data, cases, functools.partial(last_output_is, 42), max_workers=2, chunk_size=4)
+
+    # THEN
+    assert match is None
+
+
+def test_ring_output_port_wraps_and_grows():
+    # GIVEN
+    port = RingOutputPort(capacity=4)
+    for value in range(3):
+        port.write(value)
+    port.consume(2)
+
+    # WHEN: writes wrap around the end of the ring and then overflow it
+    for value in range(3, 6):
+        port.write(value)
+    first, second = port.views()
+    wrapped = first.tolist() + second.tolist()
+    for value in range(6, 9):
+        port.write(value)
+
+    # THEN
+    assert wrapped == [2, 3, 4, 5]
+    assert len(port) == 7
+    assert port.drain() == [2, 3, 4, 5, 6, 7, 8]
+    assert len(port) == 0
+
+
+def test_object_ports():
+    # GIVEN: a port object doubling each output back in as the next input
+    class Doubler:
+        def __init__(self):
+            self.values = [1]
+
+        def read(self):
+            return self.values[-1]
+
+        def write(self, value):
+            self.values.append(value * 2)
+
+    data = [3, 11, 4, 11, 3, 11, 4, 11, 99, 0, 0, 0]
+    doubler = Doubler()
+    computer = Computer(data, input_port=doubler, output_port=doubler)
+
+    # WHEN
+    computer.run()
+
+    # THEN
+    assert doubler.values == [1, 2, 4]
+    assert computer.output_history == [1, 2]
+
+
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_profiler_counts(precompile, tmp_path):
+    # GIVEN: a loop counting memory[10] down from 3
+    data = [1001, 10, -1, 10, 1005, 10, 0, 99, 0, 0, 3]
+    profile_path = tmp_path / "profile.json"
+    computer = Computer(data, precompile=precompile, profile_path=str(profile_path))
+
+    # WHEN
+    result = computer.run()
+
+    # THEN
+    profiler = computer.profiler
+    assert profiler.opcode_counts == {Computer.ADD: 3, Computer.JUMP_IF_TRUE: 3}
+    assert profiler.address_counts == {0: 3, 4: 3}
+    assert profiler.jump_targets == {0: 2}
+    assert profiler.report()["blocks"] == [{"start": 0, "end": 4, "entries": 3, "steps": 6}]
+    assert json.loads(profile_path.read_text())["steps"] == 6
+    assert "JUMP_IF_TRUE" in profile_path.with_suffix(".txt").read_text()
+    assert computer.steps == 6
+    assert result == 0
+
+
+def test_profiler_disabled_by_default():
+    # GIVEN
+    computer = Computer([99])
+
+    # THEN
+    assert computer.profiler is None
+
+
+@pytest.mark.parametrize(
+    "data, feature_level, error",
+    [
+        pytest.param([104, 1, 99], 1, UnknownOpCode, id="output-before-day-5"),
+        pytest.param([1101, 1, 1, 0, 99], 1, UnknownMode, id="immediate-before-day-5"),
+        pytest.param([109, 1, 99], 2, UnknownOpCode, id="relative-base-before-day-9"),
+        pytest.param([22201, 0, 0, 0, 99], 2, UnknownMode, id="relative-mode-before-day-9"),
+    ]
+)
+@pytest.mark.parametrize("precompile", [False, True], ids=["interpreted", "precompiled"])
+def test_feature_level_rejects_later_instructions(data, feature_level, error, precompile):
+    # GIVEN
+    computer = Computer(data, output_port=BufferPort(), feature_level=feature_level, precompile=precompile)
+
+    # THEN
+    with pytest.raises(error):
+        computer.run()
+
+
+def test_benchmark_measure():
+    # WHEN
+    result = measure("day02", "precompiled")
+
+    # THEN
+    assert result["steps"] > 0
+    assert result["steps_per_sec"] > 0
+    assert result["peak_rss_kb"] > 0
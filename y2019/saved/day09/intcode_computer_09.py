@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Tuple, Callable
+from typing import List, Tuple, Callable, Dict
 
 Instruction = Tuple[int, int, int, int]
 
@@ -23,19 +23,46 @@ class IntcodeComputerV4:
     POSITION_MODE = 0
     IMMEDIATE_MODE = 1
     RELATIVE_MODE = 2
+    # Memory beyond the original program is allocated in pages of this size
+    PAGE_SHIFT = 10
+    PAGE_SIZE = 1 << PAGE_SHIFT
+    PAGE_MASK = PAGE_SIZE - 1
 
     def __init__(self, original_program: List[int]):
         self._program = [v for v in original_program]
+        # Pages beyond the original program, allocated only when written
+        self._extended_memory = {}  # type: Dict[int, List[int]]
+        # One past the highest address written
+        self._memory_size = len(self._program)
         self._next_code_idx = 0
         self._relative_base = 0
 
+    @property
+    def resident_pages(self) -> int:
+        return len(self._extended_memory)
+
     def run(self) -> List[int]:
-        while self._program[self._next_code_idx] != self.HALT:
+        while self._read(self._next_code_idx) != self.HALT:
             self._execute_op_code()
         return self._program
 
+    def dump(self) -> List[int]:
+        """
+        Return all memory up to the highest address written as one flat
+        list, unwritten addresses as 0. Its size follows the highest address,
+        not the pages in use.
+        """
+        memory = self._program + [0] * (self._memory_size - len(self._program))
+        for page_num, page in self._extended_memory.items():
+            start = page_num << self.PAGE_SHIFT
+            # The first page may overlap the program, the last the end of memory
+            skip = max(len(self._program) - start, 0)
+            stop = min(start + self.PAGE_SIZE, self._memory_size)
+            memory[start + skip:stop] = page[skip:stop - start]
+        return memory
+
     def _execute_op_code(self):
-        instruction_code = self._program[self._next_code_idx]
+        instruction_code = self._read(self._next_code_idx)
         op_code, mode1, mode2, mode3 = self._interpret_instruction(instruction_code)
 
         if op_code in self.PARAMETERIZED_PROCESSES:
@@ -112,7 +139,7 @@ class IntcodeComputerV4:
     def _access_memory(self, operation: MemoryOperation, address: int,
                        value: int = None,):
         if len(self._program) <= address:
-            self._extend_memory(address)
+            return self._access_extended_memory(operation, address, value)
 
         if operation == MemoryOperation.READ:
             return self._program[address]
@@ -121,8 +148,23 @@ class IntcodeComputerV4:
         else:
             raise MemoryAccessError(operation.value)
 
-    def _extend_memory(self, address: int):
-        self._program += [0 for _ in range(address + 1 - len(self._program))]
+    def _access_extended_memory(self, operation: MemoryOperation,
+                                address: int, value: int = None):
+        page_num = address >> self.PAGE_SHIFT
+        if operation == MemoryOperation.READ:
+            page = self._extended_memory.get(page_num)
+            return 0 if page is None else page[address & self.PAGE_MASK]
+        elif operation == MemoryOperation.WRITE:
+            page = self._extended_memory.get(page_num)
+            if page is None:
+                page = self._extended_memory[page_num] = [0] * self.PAGE_SIZE
+            page[address & self.PAGE_MASK] = value
+            self._memory_size = max(self._memory_size, address + 1)
+        else:
+            raise MemoryAccessError(operation.value)
+
+    def _read(self, address: int) -> int:
+        return self._access_memory(MemoryOperation.READ, address)
 
     #########################
     # - Operation Helpers - #